@@ -0,0 +1,61 @@
+"""
+Per-message cost of the blacklist matcher for chats with 10, 1k and 10k words.
+
+Run from the repo root: python benchmarks/blacklist_matcher.py
+The module is loaded by path so database/__init__ doesn't connect to Mongo.
+"""
+
+import importlib.util
+import random
+import re
+import string
+from pathlib import Path
+from timeit import timeit
+
+spec = importlib.util.spec_from_file_location(
+    "word_matcher",
+    Path(__file__).resolve().parent.parent / "database" / "word_matcher.py",
+)
+word_matcher = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(word_matcher)
+
+random.seed(0)
+MESSAGE = (
+    "Halo semua, ada yang punya link download film terbaru minggu ini? "
+    "Kemarin nonton di bioskop tapi kurang jelas subtitle nya."
+)
+
+
+def random_words(count):
+    return {
+        "".join(random.choices(string.ascii_lowercase, k=random.randint(4, 12)))
+        for _ in range(count)
+    }
+
+
+def old_loop(words, text):
+    # Previous behaviour: one fresh regex per blacklisted word
+    text = text.lower().strip()
+    for word in words:
+        pattern = r"( |^|[^\w])" + re.escape(word) + r"( |$|[^\w])"
+        if re.search(pattern, text, flags=re.IGNORECASE):
+            return word
+
+
+def main():
+    print(f"{'words':>6} | {'old loop (us)':>14} | {'matcher (us)':>12} | {'build (ms)':>10}")
+    for count in (10, 1_000, 10_000):
+        words = list(random_words(count))
+        build = timeit(lambda: word_matcher.WordMatcher(words), number=3) / 3
+        matcher = word_matcher.WordMatcher(words)
+        runs = 2000 if count <= 1_000 else 500
+        new = timeit(
+            lambda: matcher.search(word_matcher.normalize_text(MESSAGE)), number=runs
+        ) / runs
+        old_runs = max(5, runs // (count // 10 or 1))
+        old = timeit(lambda: old_loop(words, MESSAGE), number=old_runs) / old_runs
+        print(f"{count:>6} | {old * 1e6:>14.1f} | {new * 1e6:>12.1f} | {build * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
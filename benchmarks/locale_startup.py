@@ -0,0 +1,84 @@
+"""
+Import-time and per-call cost of use_chat_lang before and after the flat locale tables.
+
+Run from the repo root: python benchmarks/locale_startup.py
+The old and new code paths are reproduced here so the bot client doesn't have to start.
+"""
+
+import inspect
+import json
+import os
+import re
+from glob import glob
+from pathlib import Path
+from timeit import timeit
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT = "en-US"
+# Plugins are imported by importlib from start_bot, decorators run this deep in the stack
+IMPORT_DEPTH = 25
+
+
+def load_locales():
+    ldict = {}
+    for file in glob(str(ROOT / "locales" / "*" / "*.json")):
+        lang, context = Path(file).parent.name, Path(file).stem
+        with open(file, encoding="utf-8") as f:
+            ldict.setdefault(lang, {})[context] = json.load(f)
+    return ldict
+
+
+def count_decorations():
+    return sum(
+        len(re.findall(r"@use_chat_lang\(", Path(f).read_text(encoding="utf-8")))
+        for f in glob(str(ROOT / "misskaty" / "plugins" / "*.py"))
+    )
+
+
+def old_context():
+    cwd = os.getcwd()
+    fname = inspect.stack()[1].filename
+    if fname.startswith(cwd):
+        fname = fname[len(cwd) + 1 :]
+    return fname
+
+
+def new_context(func):
+    return func.__module__.rsplit(".", 1)[-1]
+
+
+def nested(depth, fn, *args):
+    return nested(depth - 1, fn, *args) if depth else fn(*args)
+
+
+def main():
+    ldict = load_locales()
+    decorations = count_decorations()
+
+    old = timeit(lambda: nested(IMPORT_DEPTH, old_context), number=decorations)
+    new = timeit(lambda: nested(IMPORT_DEPTH, new_context, main), number=decorations)
+    print(f"use_chat_lang() x{decorations} at import: {old * 1e3:.1f} ms -> {new * 1e3:.3f} ms")
+
+    # Old lookup: nested dicts plus fallback into the default language on every call
+    def old_lookup(dic, language, default_context, key):
+        return dic.get(key) or ldict[DEFAULT][default_context].get(key) or key
+
+    flat = {
+        lang: {
+            ctx: {**ldict[DEFAULT].get(ctx, {}), **{k: v for k, v in table.items() if v}}
+            for ctx, table in contexts.items()
+        }
+        for lang, contexts in ldict.items()
+    }
+    lang = "id-ID"
+    keys = list(ldict[DEFAULT]["admin"]) + ["missing_key"]
+    dic = ldict[lang]["admin"]
+    table = flat[lang]["admin"]
+    runs = 200_000
+    old = timeit(lambda: [old_lookup(dic, lang, "admin", k) for k in keys], number=runs // len(keys))
+    new = timeit(lambda: [table.get(k, k) for k in keys], number=runs // len(keys))
+    print(f"strings(key) x{runs}: {old * 1e3:.1f} ms -> {new * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,8 @@
 
 from async_pymongo import AsyncClient
 
+from database.instrument import InstrumentedDatabase
 from misskaty.vars import DATABASE_NAME, DATABASE_URI
 
 mongo = AsyncClient(DATABASE_URI)
-dbname = mongo[DATABASE_NAME]
+dbname = InstrumentedDatabase(mongo[DATABASE_NAME])
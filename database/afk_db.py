@@ -8,16 +8,23 @@
 # All rights reserved.
 #
 
+from typing import Dict, Iterable
+
 from database import dbname
+from database.chat_state import chat_state_field, invalidate_chat_state
 
 usersdb = dbname["users"]
 cleandb = dbname["cleanmode"]
 cleanmode = {}
+# Resident index of AFK user_id, filled by load_afk_users() at startup
+afk_users = set()
+afk_loaded = False
 
 
+@chat_state_field("cleanmode")
 async def is_cleanmode_on(chat_id: int) -> bool:
     mode = cleanmode.get(chat_id)
-    if not mode:
+    if mode is None:
         user = await cleandb.find_one({"chat_id": chat_id})
         if not user:
             cleanmode[chat_id] = True
@@ -29,6 +36,7 @@ async def is_cleanmode_on(chat_id: int) -> bool:
 
 async def cleanmode_on(chat_id: int):
     cleanmode[chat_id] = True
+    invalidate_chat_state(chat_id)
     user = await cleandb.find_one({"chat_id": chat_id})
     if user:
         return await cleandb.delete_one({"chat_id": chat_id})
@@ -36,26 +44,55 @@ async def cleanmode_on(chat_id: int):
 
 async def cleanmode_off(chat_id: int):
     cleanmode[chat_id] = False
+    invalidate_chat_state(chat_id)
     user = await cleandb.find_one({"chat_id": chat_id})
     if not user:
         return await cleandb.insert_one({"chat_id": chat_id})
 
 
+async def load_afk_users():
+    global afk_loaded
+    async for user in usersdb.find({"user_id": {"$gt": 0}}, {"user_id": 1, "_id": 0}):
+        afk_users.add(user["user_id"])
+    afk_loaded = True
+
+
+def maybe_afk(user_id: int) -> bool:
+    # Before the index is loaded every user must still be checked in db
+    return not afk_loaded or user_id in afk_users
+
+
+def has_afk_users() -> bool:
+    return not afk_loaded or bool(afk_users)
+
+
 async def is_afk(user_id: int) -> bool:
+    if not maybe_afk(user_id):
+        return False, {}
     user = await usersdb.find_one({"user_id": user_id})
     return (True, user["reason"]) if user else (False, {})
 
 
+async def get_afk_reasons(user_ids: Iterable[int]) -> Dict[int, dict]:
+    user_ids = [user_id for user_id in user_ids if maybe_afk(user_id)]
+    if not user_ids:
+        return {}
+    return {
+        user["user_id"]: user["reason"]
+        async for user in usersdb.find({"user_id": {"$in": user_ids}})
+    }
+
+
 async def add_afk(user_id: int, mode):
     await usersdb.update_one(
         {"user_id": user_id}, {"$set": {"reason": mode}}, upsert=True
     )
+    afk_users.add(user_id)
 
 
 async def remove_afk(user_id: int):
-    user = await usersdb.find_one({"user_id": user_id})
-    if user:
-        return await usersdb.delete_one({"user_id": user_id})
+    afk_users.discard(user_id)
+    return await usersdb.delete_one({"user_id": user_id})
 
 
 async def get_afk_users() -> list:
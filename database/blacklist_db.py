@@ -1,6 +1,8 @@
 from typing import List
 
 from database import dbname
+from database.blacklist_engine import BlacklistEngine
+from database.chat_state import chat_state_field, invalidate_chat_state
 
 blacklist_filtersdb = dbname["blacklistFilters"]
 
@@ -19,6 +21,8 @@ async def save_blacklist_filter(chat_id: int, word: str):
         {"$set": {"filters": _filters}},
         upsert=True,
     )
+    blacklist_engine.invalidate(chat_id)
+    invalidate_chat_state(chat_id)
 
 
 async def delete_blacklist_filter(chat_id: int, word: str) -> bool:
@@ -31,5 +35,11 @@ async def delete_blacklist_filter(chat_id: int, word: str) -> bool:
             {"$set": {"filters": filtersd}},
             upsert=True,
         )
+        blacklist_engine.invalidate(chat_id)
+        invalidate_chat_state(chat_id)
         return True
     return False
+
+
+blacklist_engine = BlacklistEngine(get_blacklisted_words)
+chat_state_field("blacklist")(blacklist_engine.get_matcher)
@@ -0,0 +1,41 @@
+from typing import Awaitable, Callable, List, Optional
+
+from cachetools import LRUCache
+
+from .word_matcher import WordMatcher, normalize_text
+
+__all__ = ["BlacklistEngine"]
+
+
+class BlacklistEngine:
+    """Per-chat compiled blacklist matcher kept in memory.
+
+    ``loader`` fetches the raw word list of a chat, it is only awaited on a
+    cache miss or after :meth:`invalidate` was called by a db write.
+    """
+
+    def __init__(
+        self, loader: Callable[[int], Awaitable[List[str]]], maxsize: int = 5000
+    ):
+        self._loader = loader
+        self._matchers = LRUCache(maxsize=maxsize)
+
+    def invalidate(self, chat_id: int):
+        self._matchers.pop(chat_id, None)
+
+    @staticmethod
+    def search(matcher: WordMatcher, text: str) -> Optional[str]:
+        """Look up ``text`` in an already loaded matcher, e.g. from ChatState."""
+        if not matcher:
+            return None
+        return matcher.search(normalize_text(text))
+
+    async def get_matcher(self, chat_id: int) -> WordMatcher:
+        if chat_id not in self._matchers:
+            words = await self._loader(chat_id)
+            self._matchers[chat_id] = WordMatcher(normalize_text(w) for w in words)
+        return self._matchers[chat_id]
+
+    async def match(self, chat_id: int, text: str) -> Optional[str]:
+        """Return the blacklisted word found in ``text`` or None."""
+        return self.search(await self.get_matcher(chat_id), text)
@@ -0,0 +1,100 @@
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict
+
+from cachetools import TTLCache
+
+# field name -> loader(chat_id), registered by the database modules
+_fields: Dict[str, Callable[[int], Awaitable[Any]]] = {}
+# chat_id -> ChatState, dropped by every settings write of that chat
+_states = TTLCache(maxsize=20000, ttl=10 * 60)
+_inflight: Dict[int, asyncio.Future] = {}
+# chat_id -> number of invalidations, a load that saw it change must not be stored.
+# Outlives the snapshots, so an evicted entry can only belong to a long gone load.
+_generations = TTLCache(maxsize=20000, ttl=20 * 60)
+counters = {"updates": 0, "hits": 0, "loads": 0}
+
+
+class ChatState:
+    """Settings of one chat that the passive group handlers read on every message.
+
+    Each field is the cached result of the loader registered with
+    :func:`chat_state_field`, e.g. ``state.karma`` or ``state.blacklist``.
+    """
+
+    __slots__ = ("chat_id", "values")
+
+    def __init__(self, chat_id: int, values: Dict[str, Any]):
+        self.chat_id = chat_id
+        self.values = values
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.values[name]
+        except KeyError:
+            raise AttributeError(f"ChatState has no field {name!r}") from None
+
+
+def chat_state_field(name: str):
+    """Register ``func(chat_id)`` as the loader of ``ChatState.<name>``."""
+
+    def decorator(func):
+        _fields[name] = func
+        return func
+
+    return decorator
+
+
+def invalidate_chat_state(chat_id: int):
+    _generations[chat_id] = _generations.get(chat_id, 0) + 1
+    _states.pop(chat_id, None)
+    # Later updates start a new load instead of joining one that read old settings
+    _inflight.pop(chat_id, None)
+
+
+async def _load(chat_id: int) -> ChatState:
+    names = list(_fields)
+    generation = _generations.get(chat_id, 0)
+    # All loaders run concurrently, a cold chat costs one round of queries
+    values = await asyncio.gather(*(_fields[name](chat_id) for name in names))
+    state = ChatState(chat_id, dict(zip(names, values)))
+    if _generations.get(chat_id, 0) == generation:
+        _states[chat_id] = state
+    return state
+
+
+def _loaded(chat_id: int, task: asyncio.Future):
+    # An invalidation may already have replaced it with a newer load
+    if _inflight.get(chat_id) is task:
+        del _inflight[chat_id]
+
+
+async def get_chat_state(update) -> ChatState:
+    """Return the state of ``update.chat`` and keep it on the update for the next handlers."""
+    if state := getattr(update, "_chat_state", None):
+        return state
+    chat_id = update.chat.id
+    counters["updates"] += 1
+    state = _states.get(chat_id)
+    if state is None:
+        task = _inflight.get(chat_id)
+        if task is None:
+            counters["loads"] += 1
+            task = _inflight[chat_id] = asyncio.ensure_future(_load(chat_id))
+            task.add_done_callback(partial(_loaded, chat_id))
+        state = await asyncio.shield(task)
+    else:
+        counters["hits"] += 1
+    update._chat_state = state
+    return state
+
+
+def chat_state_stats() -> dict:
+    updates = counters["updates"]
+    return {
+        **counters,
+        "cached": len(_states),
+        "fields": list(_fields),
+        # Loads are the only time the handlers wait on Mongo
+        "loads_per_update": round(counters["loads"] / updates, 4) if updates else 0,
+    }
@@ -1,49 +1,64 @@
-from typing import Dict, List, Union
+from typing import Dict, List, Tuple, Union
 
-from database import dbname
+from cachetools import LRUCache
 
-filtersdb = dbname["filters"]
+from database.chat_state import chat_state_field, invalidate_chat_state
+from database.keyed_db import KeyedStore
+from database.word_matcher import WordMatcher
 
-
-async def _get_filters(chat_id: int) -> Dict[str, int]:
-    _filters = await filtersdb.find_one({"chat_id": chat_id})
-    return _filters["filters"] if _filters else {}
+filtersdb = KeyedStore("filters_entries", legacy=("filters", "filters"))
+# chat_id -> (compiled matcher, filter payloads), dropped on every write
+_matchers = LRUCache(maxsize=5000)
 
 
 async def delete_filter(chat_id: int, name: str) -> bool:
-    filtersd = await _get_filters(chat_id)
     name = name.lower().strip()
-    if name in filtersd:
-        del filtersd[name]
-        await filtersdb.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"filters": filtersd}},
-            upsert=True,
-        )
-        return True
-    return False
+    deleted = await filtersdb.delete(chat_id, name)
+    if deleted:
+        _matchers.pop(chat_id, None)
+        invalidate_chat_state(chat_id)
+    return deleted
 
 
 async def deleteall_filters(chat_id: int):
-    return await filtersdb.delete_one({"chat_id": chat_id})
+    result = await filtersdb.delete_all(chat_id)
+    # After the delete, a load running meanwhile could cache the old filters again
+    _matchers.pop(chat_id, None)
+    invalidate_chat_state(chat_id)
+    return result
 
 
 async def get_filter(chat_id: int, name: str) -> Union[bool, dict]:
     name = name.lower().strip()
-    _filters = await _get_filters(chat_id)
-    return _filters[name] if name in _filters else False
+    return await filtersdb.get(chat_id, name) or False
 
 
 async def get_filters_names(chat_id: int) -> List[str]:
-    return list(await _get_filters(chat_id))
+    return await filtersdb.names(chat_id)
 
 
 async def save_filter(chat_id: int, name: str, _filter: dict):
     name = name.lower().strip()
-    _filters = await _get_filters(chat_id)
-    _filters[name] = _filter
-    await filtersdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"filters": _filters}},
-        upsert=True,
-    )
+    await filtersdb.put(chat_id, name, _filter)
+    _matchers.pop(chat_id, None)
+    invalidate_chat_state(chat_id)
+
+
+@chat_state_field("filters")
+async def get_filters_matcher(chat_id: int) -> Tuple[WordMatcher, Dict[str, dict]]:
+    if chat_id not in _matchers:
+        _filters = await filtersdb.all(chat_id)
+        # Media filters without a file_id can't be sent, another matching filter answers instead
+        usable = [
+            name
+            for name, _filter in _filters.items()
+            if _filter.get("type") == "text" or _filter.get("file_id")
+        ]
+        _matchers[chat_id] = (WordMatcher(usable), _filters)
+    return _matchers[chat_id]
+
+
+async def match_filter(chat_id: int, text: str) -> Union[bool, Tuple[str, dict]]:
+    matcher, _filters = await get_filters_matcher(chat_id)
+    name = matcher.search(text)
+    return (name, _filters[name]) if name in _filters else False
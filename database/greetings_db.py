@@ -1,8 +1,10 @@
 from database import dbname
+from database.chat_state import chat_state_field, invalidate_chat_state
 
 greetingdb = dbname["greetings"]
 
 
+@chat_state_field("welcome")
 async def is_welcome(chat_id: int) -> bool:
     return bool(await greetingdb.find_one({"chat_id": chat_id}))
 
@@ -10,10 +12,12 @@ async def is_welcome(chat_id: int) -> bool:
 async def toggle_welcome(chat_id: int):
     if await is_welcome(chat_id):
         await greetingdb.delete_one({"chat_id": chat_id})
-        return False
+        enabled = False
     else:
         await greetingdb.insert_one({"chat_id": chat_id})
-        return True
+        enabled = True
+    invalidate_chat_state(chat_id)
+    return enabled
 
 
 # todo other features for custom welcome here
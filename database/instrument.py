@@ -0,0 +1,189 @@
+from collections import Counter, deque
+from inspect import isawaitable
+from time import perf_counter, time
+from typing import Dict, List, Tuple
+
+from misskaty.core.metrics import (
+    Histogram,
+    count_mongo,
+    current_handler,
+    exporters,
+    handlers,
+    histogram_lines,
+)
+
+# Cursor methods that return the cursor itself for chaining
+CURSOR_CHAIN = {"sort", "limit", "skip", "batch_size", "max_time_ms", "hint", "collation"}
+
+
+class MongoProfiler:
+    """Per collection and operation latency, with the handler that issued it.
+
+    ``calls`` counts (handler, collection, op) so a handler doing one
+    ``find_one`` per chat in a loop stands out next to its run count.
+    """
+
+    def __init__(self, slow_ms: int = 100, samples: int = 50):
+        self.slow_ms = slow_ms
+        self.ops: Dict[Tuple[str, str], Histogram] = {}
+        self.calls = Counter()
+        self.slow = deque(maxlen=samples)
+
+    def record(self, collection: str, op: str, seconds: float, error: bool, args):
+        key = (collection, op)
+        if key not in self.ops:
+            self.ops[key] = Histogram(f"{collection}.{op}")
+        self.ops[key].observe(seconds, error)
+        handler = current_handler() or "background"
+        self.calls[(handler, collection, op)] += 1
+        if seconds * 1000 >= self.slow_ms:
+            self.slow.append(
+                {
+                    "time": time(),
+                    "ms": round(seconds * 1000, 1),
+                    "op": f"{collection}.{op}",
+                    "handler": handler,
+                    "query": repr(args[0])[:200] if args else "",
+                }
+            )
+
+    def top_ops(self, limit: int = 10) -> List[tuple]:
+        rows = [(h.name, h.summary(), h.sum) for h in self.ops.values()]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return [(name, summary) for name, summary, _ in rows[:limit]]
+
+    def per_run(self, limit: int = 10) -> List[tuple]:
+        """(handler, op, calls per handler run), highest first, to spot N+1 loops."""
+        rows = []
+        for (handler, collection, op), count in self.calls.items():
+            runs = handlers[handler].count if handler in handlers else 0
+            if runs:
+                rows.append((handler, f"{collection}.{op}", count / runs))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:limit]
+
+    def prometheus_lines(self) -> List[str]:
+        lines = [
+            "# HELP misskaty_mongo_seconds Mongo operation time.",
+            "# TYPE misskaty_mongo_seconds histogram",
+        ]
+        for (collection, op), hist in self.ops.items():
+            lines.extend(
+                histogram_lines(
+                    "misskaty_mongo_seconds",
+                    f'collection="{collection}",op="{op}"',
+                    hist,
+                )
+            )
+        lines.append("# TYPE misskaty_mongo_calls_total counter")
+        lines.extend(
+            f'misskaty_mongo_calls_total{{handler="{handler}",collection="{collection}",op="{op}"}} {count}'
+            for (handler, collection, op), count in self.calls.items()
+        )
+        return lines
+
+
+profiler = MongoProfiler()
+exporters.append(profiler.prometheus_lines)
+
+
+async def _timed(collection: str, op: str, awaitable, args):
+    error = False
+    start = perf_counter()
+    try:
+        return await awaitable
+    except BaseException:
+        error = True
+        raise
+    finally:
+        profiler.record(collection, op, perf_counter() - start, error, args)
+
+
+class InstrumentedCursor:
+    """Times a find/aggregate cursor from the first fetch until it is exhausted."""
+
+    __slots__ = ("_cursor", "_collection", "_op", "_args")
+
+    def __init__(self, cursor, collection: str, op: str, args):
+        self._cursor = cursor
+        self._collection = collection
+        self._op = op
+        self._args = args
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._cursor, name)
+        if name not in CURSOR_CHAIN:
+            return attr
+
+        def chain(*args, **kwargs):
+            attr(*args, **kwargs)
+            return self
+
+        return chain
+
+    async def to_list(self, *args, **kwargs):
+        return await _timed(
+            self._collection, self._op, self._cursor.to_list(*args, **kwargs), self._args
+        )
+
+    async def __aiter__(self):
+        error = False
+        start = perf_counter()
+        try:
+            async for doc in self._cursor:
+                yield doc
+        except BaseException:
+            error = True
+            raise
+        finally:
+            profiler.record(
+                self._collection, self._op, perf_counter() - start, error, self._args
+            )
+
+
+def _instrument(target, name: str, op: str):
+    attr = getattr(target, op)
+    if op.startswith("_") or not callable(attr):
+        return attr
+
+    def call(*args, **kwargs):
+        count_mongo()
+        result = attr(*args, **kwargs)
+        if isawaitable(result):
+            return _timed(name, op, result, args)
+        if hasattr(result, "__aiter__"):
+            return InstrumentedCursor(result, name, op, args)
+        return result
+
+    return call
+
+
+class InstrumentedCollection:
+    """Proxy over an async_pymongo collection that counts and times every operation."""
+
+    __slots__ = ("_col", "name")
+
+    def __init__(self, col, name: str):
+        self._col = col
+        self.name = name
+
+    def __getattr__(self, op: str):
+        return _instrument(self._col, self.name, op)
+
+
+class InstrumentedDatabase:
+    """Proxy over an async_pymongo database, ``db[name]`` gives instrumented collections."""
+
+    __slots__ = ("_db", "_collections")
+
+    def __init__(self, db):
+        self._db = db
+        self._collections = {}
+
+    def __getitem__(self, name: str) -> InstrumentedCollection:
+        if name not in self._collections:
+            self._collections[name] = InstrumentedCollection(self._db[name], name)
+        return self._collections[name]
+
+    def __getattr__(self, op: str):
+        return _instrument(self._db, "$db", op)
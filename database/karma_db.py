@@ -1,53 +1,115 @@
-from typing import Dict, Union
+from logging import getLogger
+from typing import Dict
 
-from database import dbname
-from misskaty.helper.functions import int_to_alpha
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
 
-karmadb = dbname["karma"]
+from database import dbname
+from database.chat_state import chat_state_field, invalidate_chat_state
+from misskaty.helper.functions import alpha_to_int
 
+LOGGER = getLogger("MissKaty")
 
-async def get_karmas_count() -> dict:
-    chats_count = 0
-    karmas_count = 0
-    async for chat in karmadb.find({"chat_id": {"$lt": 0}}):
-        for i in chat["karma"]:
-            karma_ = chat["karma"][i]["karma"]
-            if karma_ > 0:
-                karmas_count += karma_
-        chats_count += 1
-    return {"chats_count": chats_count, "karmas_count": karmas_count}
+karmadb = dbname["karma"]  # Old per chat dict and karma toggle
+karmausersdb = dbname["karma_users"]  # One document per (chat_id, user_id)
 
 
-async def user_global_karma(user_id) -> int:
-    total_karma = 0
-    async for chat in karmadb.find({"chat_id": {"$lt": 0}}):
-        karma = await get_karma(chat["chat_id"], await int_to_alpha(user_id))
-        if karma and (int(karma["karma"]) > 0):
-            total_karma += int(karma["karma"])
-    return total_karma
+async def migrate_karma():
+    """Create indexes and move old per chat karma dicts to karma_users, safe to run on every start."""
+    await karmausersdb.create_index(
+        [("chat_id", ASCENDING), ("user_id", ASCENDING)], unique=True
+    )
+    await karmausersdb.create_index([("chat_id", ASCENDING), ("karma", DESCENDING)])
+    await karmausersdb.create_index("user_id")
+    async for chat in karmadb.find({"karma": {"$exists": True}}):
+        # Adds the legacy value minus what an interrupted earlier run already
+        # added, so running it again before the delete doesn't count it twice
+        batch = [
+            UpdateOne(
+                {"chat_id": chat["chat_id"], "user_id": await alpha_to_int(name)},
+                [
+                    {
+                        "$set": {
+                            "karma": {
+                                "$add": [
+                                    {"$ifNull": ["$karma", 0]},
+                                    int(value["karma"]),
+                                    {"$multiply": [-1, {"$ifNull": ["$migrated_karma", 0]}]},
+                                ]
+                            },
+                            "migrated_karma": int(value["karma"]),
+                        }
+                    }
+                ],
+                upsert=True,
+            )
+            for name, value in chat["karma"].items()
+        ]
+        if batch:
+            await karmausersdb.bulk_write(batch, ordered=False)
+        await karmadb.delete_one({"_id": chat["_id"]})
+        LOGGER.info(f"Migrated {len(batch)} karma of chat {chat['chat_id']}")
 
 
-async def get_karmas(chat_id: int) -> Dict[str, int]:
-    karma = await karmadb.find_one({"chat_id": chat_id})
-    return karma["karma"] if karma else {}
+async def get_karmas_count() -> dict:
+    result = await karmausersdb.aggregate(
+        [
+            {"$match": {"chat_id": {"$lt": 0}, "karma": {"$gt": 0}}},
+            {
+                "$group": {
+                    "_id": None,
+                    "chats": {"$addToSet": "$chat_id"},
+                    "karmas_count": {"$sum": "$karma"},
+                }
+            },
+            {"$project": {"chats_count": {"$size": "$chats"}, "karmas_count": 1}},
+        ]
+    ).to_list(length=1)
+    if not result:
+        return {"chats_count": 0, "karmas_count": 0}
+    return {
+        "chats_count": result[0]["chats_count"],
+        "karmas_count": result[0]["karmas_count"],
+    }
 
 
-async def get_karma(chat_id: int, name: str) -> Union[bool, dict]:
-    name = name.lower().strip()
-    karmas = await get_karmas(chat_id)
-    if name in karmas:
-        return karmas[name]
+async def user_global_karma(user_id) -> int:
+    result = await karmausersdb.aggregate(
+        [
+            {"$match": {"user_id": user_id, "karma": {"$gt": 0}}},
+            {"$group": {"_id": None, "total": {"$sum": "$karma"}}},
+        ]
+    ).to_list(length=1)
+    return result[0]["total"] if result else 0
+
+
+async def get_karmas(chat_id: int) -> Dict[int, int]:
+    """Karma of a chat as user_id -> karma, highest first."""
+    cursor = karmausersdb.find(
+        {"chat_id": chat_id}, {"user_id": 1, "karma": 1, "_id": 0}
+    ).sort("karma", DESCENDING)
+    return {user["user_id"]: user["karma"] async for user in cursor}
+
+
+async def get_karma(chat_id: int, user_id: int) -> int:
+    karma = await karmausersdb.find_one(
+        {"chat_id": chat_id, "user_id": user_id}, {"karma": 1, "_id": 0}
+    )
+    return karma["karma"] if karma else 0
 
 
-async def update_karma(chat_id: int, name: str, karma: dict):
-    name = name.lower().strip()
-    karmas = await get_karmas(chat_id)
-    karmas[name] = karma
-    await karmadb.update_one(
-        {"chat_id": chat_id}, {"$set": {"karma": karmas}}, upsert=True
+async def update_karma(chat_id: int, user_id: int, amount: int) -> int:
+    """Atomically add ``amount`` to user karma and return the new total."""
+    karma = await karmausersdb.find_one_and_update(
+        {"chat_id": chat_id, "user_id": user_id},
+        {"$inc": {"karma": amount}},
+        projection={"karma": 1, "_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
     )
+    return karma["karma"]
 
 
+@chat_state_field("karma")
 async def is_karma_on(chat_id: int) -> bool:
     chat = await karmadb.find_one({"chat_id_toggle": chat_id})
     return not chat
@@ -57,11 +119,15 @@ async def karma_on(chat_id: int):
     is_karma = await is_karma_on(chat_id)
     if is_karma:
         return
-    return await karmadb.delete_one({"chat_id_toggle": chat_id})
+    res = await karmadb.delete_one({"chat_id_toggle": chat_id})
+    invalidate_chat_state(chat_id)
+    return res
 
 
 async def karma_off(chat_id: int):
     is_karma = await is_karma_on(chat_id)
     if not is_karma:
         return
-    return await karmadb.insert_one({"chat_id_toggle": chat_id})
+    res = await karmadb.insert_one({"chat_id_toggle": chat_id})
+    invalidate_chat_state(chat_id)
+    return res
@@ -0,0 +1,92 @@
+from logging import getLogger
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.results import DeleteResult
+
+from database import dbname
+
+LOGGER = getLogger("MissKaty")
+
+
+class KeyedStore:
+    """One document per (chat_id, name) instead of a whole dict per chat.
+
+    Used by notes, filters and warns. ``legacy`` is the old collection and
+    field name (e.g. ``("notes", "notes")``) that :meth:`migrate` converts.
+    """
+
+    stores: List["KeyedStore"] = []
+
+    def __init__(self, collection: str, legacy: Optional[tuple] = None):
+        self.name = collection
+        self.col = dbname[collection]
+        self.legacy = legacy
+        KeyedStore.stores.append(self)
+
+    async def get(self, chat_id: int, name: str) -> Optional[Any]:
+        entry = await self.col.find_one(
+            {"chat_id": chat_id, "name": name}, {"value": 1, "_id": 0}
+        )
+        return entry["value"] if entry else None
+
+    async def put(self, chat_id: int, name: str, value: Any):
+        await self.col.update_one(
+            {"chat_id": chat_id, "name": name},
+            {"$set": {"value": value}},
+            upsert=True,
+        )
+
+    async def delete(self, chat_id: int, name: str) -> bool:
+        res = await self.col.delete_one({"chat_id": chat_id, "name": name})
+        return res.deleted_count > 0
+
+    async def names(self, chat_id: int) -> List[str]:
+        cursor = self.col.find({"chat_id": chat_id}, {"name": 1, "_id": 0})
+        return [entry["name"] async for entry in cursor]
+
+    async def all(self, chat_id: int) -> Dict[str, Any]:
+        cursor = self.col.find({"chat_id": chat_id}, {"name": 1, "value": 1, "_id": 0})
+        return {entry["name"]: entry["value"] async for entry in cursor}
+
+    async def delete_all(self, chat_id: int) -> DeleteResult:
+        return await self.col.delete_many({"chat_id": chat_id})
+
+    async def migrate(self):
+        """Create indexes and move legacy per chat dicts over, safe to run on every start.
+
+        Must finish before updates are handled, reads and deletes during the
+        move would see or undo a half migrated chat.
+        """
+        await self.col.create_index(
+            [("chat_id", ASCENDING), ("name", ASCENDING)], unique=True
+        )
+        if not self.legacy:
+            return
+        collection, field = self.legacy
+        legacy = dbname[collection]
+        async for chat in legacy.find({field: {"$exists": True}}):
+            # $setOnInsert so entries written after the upgrade are kept
+            batch = [
+                UpdateOne(
+                    {"chat_id": chat["chat_id"], "name": name},
+                    {"$setOnInsert": {"value": value}},
+                    upsert=True,
+                )
+                for name, value in chat[field].items()
+            ]
+            if batch:
+                await self.col.bulk_write(batch, ordered=False)
+            await legacy.delete_one({"_id": chat["_id"]})
+            LOGGER.info(
+                f"Migrated {len(batch)} {field} of chat {chat['chat_id']} to {self.name}"
+            )
+
+
+async def migrate_keyed_stores():
+    """Migrate every store, awaited before the plugins register their handlers."""
+    # The stores register on import, normally that happens with the plugins
+    from database import filters_db, notes_db, warn_db  # noqa: F401
+
+    for store in KeyedStore.stores:
+        await store.migrate()
@@ -1,10 +1,14 @@
 from typing import Iterable
 
+from cachetools import TTLCache
 from pyrogram.enums import ChatType
 
 from database import dbname
+from database.chat_state import chat_state_field, invalidate_chat_state
 
 localesdb = dbname["locale"]  # DB for localization
+# chat_id -> lang, also keep chats without setting to skip the lookup
+lang_cache = TTLCache(maxsize=20000, ttl=30 * 60)
 
 group_types: Iterable[ChatType] = (ChatType.GROUP, ChatType.SUPERGROUP)
 
@@ -15,8 +19,14 @@ async def set_db_lang(chat_id: int, chat_type: str, lang_code: str):
         {"$set": {"lang": lang_code, "chat_type": chat_type.value}},
         upsert=True,
     )
+    lang_cache[chat_id] = lang_code
+    invalidate_chat_state(chat_id)
 
 
+@chat_state_field("lang")
 async def get_db_lang(chat_id: int) -> str:
-    ul = await localesdb.find_one({"chat_id": chat_id})
-    return ul["lang"] if ul else {}
+    if chat_id in lang_cache:
+        return lang_cache[chat_id]
+    ul = await localesdb.find_one({"chat_id": chat_id}, {"lang": 1, "_id": 0})
+    lang_cache[chat_id] = ul["lang"] if ul else {}
+    return lang_cache[chat_id]
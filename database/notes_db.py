@@ -1,48 +1,28 @@
-from typing import Dict, List, Union
+from typing import List, Union
 
-from database import dbname
+from database.keyed_db import KeyedStore
 
-notesdb = dbname["notes"]
-
-
-async def _get_notes(chat_id: int) -> Dict[str, int]:
-    _notes = await notesdb.find_one({"chat_id": chat_id})
-    return _notes["notes"] if _notes else {}
+notesdb = KeyedStore("notes_entries", legacy=("notes", "notes"))
 
 
 async def delete_note(chat_id: int, name: str) -> bool:
-    notesd = await _get_notes(chat_id)
     name = name.lower().strip()
-    if name in notesd:
-        del notesd[name]
-        await notesdb.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"notes": notesd}},
-            upsert=True,
-        )
-        return True
-    return False
+    return await notesdb.delete(chat_id, name)
 
 
 async def get_note(chat_id: int, name: str) -> Union[bool, dict]:
     name = name.lower().strip()
-    _notes = await _get_notes(chat_id)
-    return _notes[name] if name in _notes else False
+    return await notesdb.get(chat_id, name) or False
 
 
 async def get_note_names(chat_id: int) -> List[str]:
-    return list(await _get_notes(chat_id))
+    return await notesdb.names(chat_id)
 
 
 async def save_note(chat_id: int, name: str, note: dict):
     name = name.lower().strip()
-    _notes = await _get_notes(chat_id)
-    _notes[name] = note
-
-    await notesdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"notes": _notes}}, upsert=True
-    )
+    await notesdb.put(chat_id, name, note)
 
 
 async def deleteall_notes(chat_id: int):
-    return await notesdb.delete_one({"chat_id": chat_id})
+    return await notesdb.delete_all(chat_id)
@@ -1,6 +1,22 @@
+import asyncio
+from logging import getLogger
+from typing import Optional, Tuple
+
+from cachetools import LRUCache
+from pymongo import UpdateOne
+
 from database import dbname
+from database.chat_state import chat_state_field, invalidate_chat_state
+
+LOGGER = getLogger("MissKaty")
 
 matadb = dbname["sangmata"]
+# user_id -> (username, first_name, last_name) last seen by the bot
+identities = LRUCache(maxsize=50000)
+# Changed identities waiting for the next bulk flush
+pending_userdata = {}
+sangmata_chats = set()
+sangmata_loaded = False
 
 
 # Get Data User
@@ -15,6 +31,8 @@ async def get_userdata(user_id: int) -> bool:
 
 
 async def add_userdata(user_id: int, username, first_name, last_name):
+    identities[user_id] = (username, first_name, last_name)
+    pending_userdata.pop(user_id, None)
     await matadb.update_one(
         {"user_id": user_id},
         {
@@ -28,15 +46,83 @@ async def add_userdata(user_id: int, username, first_name, last_name):
     )
 
 
+async def track_userdata(
+    user_id: int, username, first_name, last_name
+) -> Optional[Tuple[str, str, str]]:
+    """Return the previous identity if the user changed it, else None.
+
+    Unchanged users are answered from memory, changes are queued for flush_userdata().
+    """
+    current = (username, first_name, last_name)
+    if user_id in identities:
+        before = identities[user_id]
+    else:
+        user = await matadb.find_one(
+            {"user_id": user_id}, {"username": 1, "first_name": 1, "last_name": 1}
+        )
+        before = (
+            (user["username"], user["first_name"], user["last_name"]) if user else None
+        )
+    identities[user_id] = current
+    if before == current:
+        return None
+    pending_userdata[user_id] = current
+    return before
+
+
+async def flush_userdata():
+    if not pending_userdata:
+        return
+    flushing = dict(pending_userdata)
+    batch = [
+        UpdateOne(
+            {"user_id": user_id},
+            {
+                "$set": {
+                    "username": username,
+                    "first_name": first_name,
+                    "last_name": last_name,
+                }
+            },
+            upsert=True,
+        )
+        for user_id, (username, first_name, last_name) in flushing.items()
+    ]
+    await matadb.bulk_write(batch, ordered=False)
+    # Only after the write succeeded, and keep identities that changed again meanwhile
+    for user_id, identity in flushing.items():
+        if pending_userdata.get(user_id) == identity:
+            del pending_userdata[user_id]
+
+
+async def userdata_flusher(interval: int = 5):
+    while not await asyncio.sleep(interval):
+        try:
+            await flush_userdata()
+        except Exception as e:
+            LOGGER.error(f"Failed to flush sangmata userdata: {e}")
+
+
 # Enable Mata MissKaty in Selected Chat
+@chat_state_field("sangmata")
 async def is_sangmata_on(chat_id: int) -> bool:
-    chat = await matadb.find_one({"chat_id_toggle": chat_id})
-    return bool(chat)
+    global sangmata_loaded
+    if not sangmata_loaded:
+        async for chat in matadb.find(
+            {"chat_id_toggle": {"$exists": True}}, {"chat_id_toggle": 1}
+        ):
+            sangmata_chats.add(chat["chat_id_toggle"])
+        sangmata_loaded = True
+    return chat_id in sangmata_chats
 
 
 async def sangmata_on(chat_id: int) -> bool:
     await matadb.insert_one({"chat_id_toggle": chat_id})
+    sangmata_chats.add(chat_id)
+    invalidate_chat_state(chat_id)
 
 
 async def sangmata_off(chat_id: int):
     await matadb.delete_one({"chat_id_toggle": chat_id})
+    sangmata_chats.discard(chat_id)
+    invalidate_chat_state(chat_id)
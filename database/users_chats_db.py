@@ -1,14 +1,19 @@
 from async_pymongo import AsyncClient
+from cachetools import LRUCache
 
+from database.chat_state import chat_state_field, invalidate_chat_state
+from database.instrument import InstrumentedDatabase
 from misskaty.vars import DATABASE_NAME, DATABASE_URI
 
 
 class UsersData:
     def __init__(self, uri, database_name):
         self._client = AsyncClient(uri)
-        self.db = self._client[database_name]
+        self.db = InstrumentedDatabase(self._client[database_name])
         self.col = self.db["userlist"]
         self.grp = self.db["groups"]
+        # Write-through registry of chat_id -> chat_status, filled lazily
+        self._chats = LRUCache(maxsize=20000)
 
     @staticmethod
     def new_user(id, name):
@@ -60,8 +65,7 @@ class UsersData:
         await self.col.delete_many({"id": int(user_id)})
 
     async def is_chat_exist(self, id):
-        user = await self.grp.find_one({"id": int(id)})
-        return bool(user)
+        return bool(await self.get_chat(id))
 
     async def get_banned(self):
         users = self.col.find({"ban_status.is_banned": True})
@@ -73,28 +77,46 @@ class UsersData:
     async def add_chat(self, chat, title):
         chat = self.new_group(chat, title)
         await self.grp.insert_one(chat)
+        self._chats[int(chat["id"])] = dict(chat["chat_status"])
+        invalidate_chat_state(int(chat["id"]))
 
     async def get_chat(self, chat):
-        chat = await self.grp.find_one({"id": int(chat)})
-        return chat.get("chat_status") if chat else False
+        chat = int(chat)
+        if chat in self._chats:
+            return self._chats[chat]
+        data = await self.grp.find_one({"id": chat}, {"chat_status": 1})
+        if not data:
+            return False
+        self._chats[chat] = data.get("chat_status")
+        return self._chats[chat]
 
     async def re_enable_chat(self, id):
         chat_status = dict(
             is_disabled=False,
             reason="",
         )
-        await self.grp.update_one(
+        res = await self.grp.update_one(
             {"id": int(id)}, {"$set": {"chat_status": chat_status}}
         )
+        self._update_chat_status(id, chat_status, res)
 
     async def disable_chat(self, chat, reason="No Reason"):
         chat_status = dict(
             is_disabled=True,
             reason=reason,
         )
-        await self.grp.update_one(
+        res = await self.grp.update_one(
             {"id": int(chat)}, {"$set": {"chat_status": chat_status}}
         )
+        self._update_chat_status(chat, chat_status, res)
+
+    def _update_chat_status(self, chat, chat_status, res):
+        # Only cache chats that really exist in db, update_one doesn't upsert here
+        if res.matched_count:
+            self._chats[int(chat)] = chat_status
+        else:
+            self._chats.pop(int(chat), None)
+        invalidate_chat_state(int(chat))
 
     async def total_chat_count(self):
         return await self.grp.count_documents({})
@@ -107,3 +129,4 @@ class UsersData:
 
 
 db = UsersData(DATABASE_URI, DATABASE_NAME)
+chat_state_field("chat_status")(db.get_chat)
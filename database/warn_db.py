@@ -1,51 +1,46 @@
 from typing import Dict, Union
 
-from database import dbname
+from database.keyed_db import KeyedStore
 
-warnsdb = dbname["warn"]
+warnsdb = KeyedStore("warn_entries", legacy=("warn", "warns"))
 
 
 async def get_warns_count() -> dict:
-    chats_count = 0
-    warns_count = 0
-    async for chat in warnsdb.find({"chat_id": {"$lt": 0}}):
-        for user in chat["warns"]:
-            warns_count += chat["warns"][user]["warns"]
-        chats_count += 1
-    return {"chats_count": chats_count, "warns_count": warns_count}
+    result = await warnsdb.col.aggregate(
+        [
+            {"$match": {"chat_id": {"$lt": 0}}},
+            {
+                "$group": {
+                    "_id": None,
+                    "chats": {"$addToSet": "$chat_id"},
+                    "warns_count": {"$sum": "$value.warns"},
+                }
+            },
+            {"$project": {"chats_count": {"$size": "$chats"}, "warns_count": 1}},
+        ]
+    ).to_list(length=1)
+    if not result:
+        return {"chats_count": 0, "warns_count": 0}
+    return {
+        "chats_count": result[0]["chats_count"],
+        "warns_count": result[0]["warns_count"],
+    }
 
 
 async def get_warns(chat_id: int) -> Dict[str, int]:
-    warns = await warnsdb.find_one({"chat_id": chat_id})
-    return warns["warns"] if warns else {}
+    return await warnsdb.all(chat_id)
 
 
 async def get_warn(chat_id: int, name: str) -> Union[bool, dict]:
     name = name.lower().strip()
-    warns = await get_warns(chat_id)
-    if name in warns:
-        return warns[name]
+    return await warnsdb.get(chat_id, name)
 
 
 async def add_warn(chat_id: int, name: str, warn: dict):
     name = name.lower().strip()
-    warns = await get_warns(chat_id)
-    warns[name] = warn
-
-    await warnsdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"warns": warns}}, upsert=True
-    )
+    await warnsdb.put(chat_id, name, warn)
 
 
 async def remove_warns(chat_id: int, name: str) -> bool:
-    warnsd = await get_warns(chat_id)
     name = name.lower().strip()
-    if name in warnsd:
-        del warnsd[name]
-        await warnsdb.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"warns": warnsd}},
-            upsert=True,
-        )
-        return True
-    return False
+    return await warnsdb.delete(chat_id, name)
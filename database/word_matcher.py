@@ -0,0 +1,74 @@
+import re
+from typing import Iterable, Optional
+from unicodedata import normalize
+
+__all__ = ["WordMatcher", "normalize_text"]
+
+
+def normalize_text(text: str) -> str:
+    """NFKC normalize and casefold, so fancy fonts and full-width chars match plain words."""
+    return normalize("NFKC", text).casefold().strip()
+
+
+class WordMatcher:
+    """Match many words at once with a single compiled regex.
+
+    Words are folded into a trie and emitted as one nested pattern, so a
+    scan costs one pass over the text instead of one ``re.search`` per word.
+    A word only matches when it is not glued to other word characters,
+    same as the old ``( |^|[^\\w])word( |$|[^\\w])`` checks.
+    """
+
+    __slots__ = ("words", "_regex")
+
+    def __init__(self, words: Iterable[str]):
+        self.words = {w for w in words if w}
+        self._regex = None
+        if self.words:
+            trie = {}
+            for word in self.words:
+                node = trie
+                for char in word:
+                    node = node.setdefault(char, {})
+                node[""] = True
+            body = self._trie_pattern(trie)
+            self._regex = re.compile(rf"(?<!\w)(?:{body})(?!\w)", re.IGNORECASE)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __bool__(self):
+        return bool(self.words)
+
+    @classmethod
+    def _trie_pattern(cls, node: dict) -> str:
+        end = "" in node
+        alts = []
+        for char in sorted(k for k in node if k):
+            # Walk single-branch chains in a loop so long sentences don't recurse per char
+            prefix, child = char, node[char]
+            while len(child) == 1 and "" not in child:
+                (nxt, child), = child.items()
+                prefix += nxt
+            alts.append(re.escape(prefix) + cls._trie_pattern(child))
+        if not alts:
+            return ""
+        group = alts[0] if len(alts) == 1 else f"(?:{'|'.join(alts)})"
+        # Longest match first, then allow the word to end here
+        return f"(?:{group})?" if end else group
+
+    def search(self, text: str) -> Optional[str]:
+        """Return the first word found in ``text`` or None."""
+        if not self._regex or not text:
+            return None
+        match = self._regex.search(text)
+        if not match:
+            return None
+        found = match.group(0).lower()
+        if found in self.words:
+            return found
+        # IGNORECASE matched a different casing than the stored word
+        return next(
+            (w for w in self.words if re.fullmatch(re.escape(w), found, re.I)),
+            found,
+        )
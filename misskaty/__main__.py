@@ -16,6 +16,10 @@ from pyrogram import __version__, idle
 from pyrogram.raw.all import layer
 
 from database import dbname
+from database.afk_db import load_afk_users
+from database.karma_db import migrate_karma
+from database.keyed_db import migrate_keyed_stores
+from database.sangmata_db import flush_userdata, userdata_flusher
 from misskaty import (
     BOT_NAME,
     BOT_USERNAME,
@@ -26,6 +30,8 @@ from misskaty import (
     scheduler,
     run_wsgi
 )
+from misskaty.core.watchdog import watchdog
+from misskaty.helper.sqlite_helper import cache_sweeper
 from misskaty.plugins import ALL_MODULES
 from misskaty.plugins.web_scraper import web
 from misskaty.vars import OWNER_ID, USER_SESSION
@@ -36,6 +42,9 @@ LOGGER = getLogger("MissKaty")
 
 # Run Bot
 async def start_bot():
+    # Before the plugins register their handlers, so no update reads half migrated data
+    await migrate_karma()
+    await migrate_keyed_stores()
     for module in ALL_MODULES:
         imported_module = importlib.import_module(f"misskaty.plugins.{module}")
         if hasattr(imported_module, "__MODULE__") and imported_module.__MODULE__:
@@ -86,8 +95,17 @@ async def start_bot():
             message_id=message_id,
             text="<b>Bot restarted successfully!</b>",
         )
+    asyncio.create_task(watchdog.run())
     asyncio.create_task(auto_clean())
+    asyncio.create_task(load_afk_users())
+    asyncio.create_task(userdata_flusher())
+    asyncio.create_task(cache_sweeper())
     await idle()
+    # Identity changes queued since the last periodic flush
+    try:
+        await flush_userdata()
+    except Exception as e:
+        LOGGER.error(f"Failed to flush sangmata userdata: {e}")
 
 
 if __name__ == "__main__":
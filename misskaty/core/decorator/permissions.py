@@ -1,49 +1,75 @@
+import asyncio
 from functools import partial, wraps
 from time import time
 from traceback import format_exc as err
-from typing import Optional, Union
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
 
+from cachetools import LRUCache, TTLCache
 from pyrogram import Client, enums
 from pyrogram.errors import ChannelPrivate, ChatAdminRequired, ChatWriteForbidden
-from pyrogram.types import CallbackQuery, Message
+from pyrogram.types import CallbackQuery, ChatMember, Message
 
 from misskaty import app
-from misskaty.helper.sqlite_helper import Cache
+from misskaty.core.misskaty_patch.utils import privileges_set
+from misskaty.helper.sqlite_helper import AsyncCache
 from misskaty.vars import SUDO, OWNER_ID
 
-from ...helper.localization import (
-    default_language,
-    get_lang,
-    get_locale_string,
-    langdict,
-)
+from ...helper.localization import get_lang, get_strings
 
 
-async def member_permissions(chat_id: int, user_id: int):
-    perms = []
+class MemberPrivileges:
+    """(chat_id, user_id) -> (status, privileges) for a few minutes.
+
+    Shared by adminsOnly, require_admin and the inline admin callbacks so a
+    burst of admin commands costs one get_chat_member. Entries are replaced
+    from chat_member_updated as soon as a member is promoted or demoted.
+    """
+
+    def __init__(self, ttl: int = 300, maxsize: int = 20000):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self, chat_id: int, user_id: int
+    ) -> Tuple[enums.ChatMemberStatus, FrozenSet[str]]:
+        key = (chat_id, user_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        member = await app.get_chat_member(chat_id, user_id)
+        return self.update(chat_id, member)
+
+    def update(
+        self, chat_id: int, member: ChatMember
+    ) -> Tuple[enums.ChatMemberStatus, FrozenSet[str]]:
+        entry = (member.status, privileges_set(member.privileges))
+        self._cache[(chat_id, member.user.id)] = entry
+        return entry
+
+    def invalidate(self, chat_id: int, user_id: int):
+        self._cache.pop((chat_id, user_id), None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0,
+        }
+
+
+member_privileges = MemberPrivileges()
+
+
+async def member_permissions(chat_id: int, user_id: int) -> FrozenSet[str]:
     try:
-        member = (await app.get_chat_member(chat_id, user_id)).privileges
-        if member.can_post_messages:
-            perms.append("can_post_messages")
-        if member.can_edit_messages:
-            perms.append("can_edit_messages")
-        if member.can_delete_messages:
-            perms.append("can_delete_messages")
-        if member.can_restrict_members:
-            perms.append("can_restrict_members")
-        if member.can_promote_members:
-            perms.append("can_promote_members")
-        if member.can_change_info:
-            perms.append("can_change_info")
-        if member.can_invite_users:
-            perms.append("can_invite_users")
-        if member.can_pin_messages:
-            perms.append("can_pin_messages")
-        if member.can_manage_video_chats:
-            perms.append("can_manage_video_chats")
-        return perms
+        return (await member_privileges.get(chat_id, user_id))[1]
     except:
-        return []
+        return frozenset()
 
 
 async def check_perms(
@@ -61,16 +87,18 @@ async def check_perms(
     if not message.from_user:
         return bool(message.sender_chat and message.sender_chat.id == message.chat.id)
     try:
-        user = await chat.get_member(message.from_user.id)
+        status, privileges = await member_privileges.get(
+            chat.id, message.from_user.id
+        )
     except ChatAdminRequired:
         return False
-    if user.status == enums.ChatMemberStatus.OWNER:
+    if status == enums.ChatMemberStatus.OWNER:
         return True
 
     # No permissions specified, accept being an admin.
-    if not permissions and user.status == enums.ChatMemberStatus.ADMINISTRATOR:
+    if not permissions and status == enums.ChatMemberStatus.ADMINISTRATOR:
         return True
-    if user.status != enums.ChatMemberStatus.ADMINISTRATOR:
+    if status != enums.ChatMemberStatus.ADMINISTRATOR:
         if complain_missing_perms:
             await sender(strings("no_admin_error"))
         return False
@@ -81,7 +109,7 @@ async def check_perms(
     missing_perms = [
         permission
         for permission in permissions
-        if not getattr(user.privileges, permission)
+        if permission not in privileges
     ]
 
     if not missing_perms:
@@ -93,30 +121,78 @@ async def check_perms(
     return False
 
 
-admins_in_chat = Cache(filename="admin_cache.db", path="cache", in_memory=False)
+class AdminCache:
+    """Admin ids per chat, kept in memory and persisted to sqlite so restarts stay warm.
 
+    A lookup is a dict hit. Admin lists older than ``refresh_after`` are
+    fetched again, and concurrent misses for the same chat share one
+    ``get_chat_members`` call instead of each walking the admin list.
+    """
 
-async def list_admins(chat_id: int):
-    if chat_id in admins_in_chat:
-        interval = time() - admins_in_chat[chat_id]["last_updated_at"]
-        if interval < 3600:
-            return admins_in_chat[chat_id]["data"]
+    def __init__(self, refresh_after: int = 3600, maxsize: int = 10000):
+        self.refresh_after = refresh_after
+        self._store = AsyncCache(filename="admin_cache.db", path="cache", in_memory=False)
+        self._mem = LRUCache(maxsize=maxsize)
+        self._inflight: Dict[int, asyncio.Future] = {}
+
+    async def _entry(self, chat_id: int) -> Optional[dict]:
+        entry = self._mem.get(chat_id)
+        if entry is None:
+            entry = await self._store.get(chat_id)
+            if entry is not None:
+                self._mem[chat_id] = entry
+        return entry
 
+    async def set(self, chat_id: int, admins: List[int]):
+        entry = {"last_updated_at": time(), "data": admins}
+        self._mem[chat_id] = entry
+        await self._store.set(chat_id, entry, timeout=6 * 60 * 60)
+
+    async def update_member(self, chat_id: int, user_id: int, is_admin: bool):
+        """Apply a promotion or demotion from a chat_member_updated event, no RPC needed."""
+        entry = await self._entry(chat_id)
+        if entry is None:
+            return
+        admins = [i for i in entry["data"] if i != user_id]
+        if is_admin:
+            admins.append(user_id)
+        entry = {"last_updated_at": entry["last_updated_at"], "data": admins}
+        self._mem[chat_id] = entry
+        await self._store.set(chat_id, entry, timeout=6 * 60 * 60)
+
+    async def clear(self):
+        self._mem.clear()
+        await self._store.clear()
+
+    async def _fetch(self, chat_id: int) -> List[int]:
+        admins = [
+            member.user.id
+            async for member in app.get_chat_members(
+                chat_id, filter=enums.ChatMembersFilter.ADMINISTRATORS
+            )
+        ]
+        await self.set(chat_id, admins)
+        return admins
+
+    async def get(self, chat_id: int) -> List[int]:
+        entry = await self._entry(chat_id)
+        if entry and time() - entry["last_updated_at"] < self.refresh_after:
+            return entry["data"]
+        task = self._inflight.get(chat_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(chat_id))
+            self._inflight[chat_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(chat_id, None))
+        # shield so one cancelled waiter doesn't abort the fetch for the others
+        return await asyncio.shield(task)
+
+
+admins_in_chat = AdminCache()
+
+
+async def list_admins(chat_id: int):
     try:
-        admins_in_chat.add(
-            chat_id,
-            {
-                "last_updated_at": time(),
-                "data": [
-                    member.user.id
-                    async for member in app.get_chat_members(
-                        chat_id, filter=enums.ChatMembersFilter.ADMINISTRATORS
-                    )
-                ],
-            },
-            timeout=6 * 60 * 60,
-        )
-        return admins_in_chat[chat_id]["data"]
+        return await admins_in_chat.get(chat_id)
     except ChannelPrivate:
         return
 
@@ -185,12 +261,7 @@ def require_admin(
             client: Client, message: Union[CallbackQuery, Message], *args, **kwargs
         ):
             lang = await get_lang(message)
-            strings = partial(
-                get_locale_string,
-                langdict[lang].get("admin", langdict[default_language]["admin"]),
-                lang,
-                "admin",
-            )
+            strings = get_strings(lang, "admin")
 
             if isinstance(message, CallbackQuery):
                 sender = partial(message.answer, show_alert=True)
@@ -0,0 +1,188 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+from pyrogram import ContinuePropagation, StopPropagation
+
+__all__ = [
+    "Histogram",
+    "count_mongo",
+    "count_rpc",
+    "current_handler",
+    "exporters",
+    "histogram_lines",
+    "instrument_handler",
+    "render_prometheus",
+    "slowest_handlers",
+]
+
+# Upper bounds in seconds, same spirit as the Prometheus client defaults
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Bucketed latency with count, sum and error count."""
+
+    __slots__ = ("name", "counts", "count", "sum", "errors", "rpc", "mongo")
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+        self.rpc = 0
+        self.mongo = 0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                if i == len(BUCKETS):
+                    return BUCKETS[-1]
+                lower = BUCKETS[i - 1] if i else 0.0
+                return lower + (BUCKETS[i] - lower) * (rank - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "rpc": self.rpc,
+            "mongo": self.mongo,
+        }
+
+
+# "plugin.function" -> Histogram
+handlers: Dict[str, Histogram] = {}
+# handler group -> Histogram
+groups: Dict[int, Histogram] = {}
+totals = {"updates": 0, "rpc": 0, "mongo": 0}
+# Extra metric sources appended to /metrics, each returns exposition lines
+exporters: List[Callable[[], List[str]]] = []
+# Histogram of the handler currently running, so RPC and Mongo calls can be attributed
+_running: ContextVar[Optional[Histogram]] = ContextVar("running_handler", default=None)
+
+
+def count_rpc():
+    totals["rpc"] += 1
+    if hist := _running.get():
+        hist.rpc += 1
+
+
+def count_mongo():
+    totals["mongo"] += 1
+    if hist := _running.get():
+        hist.mongo += 1
+
+
+def current_handler() -> Optional[str]:
+    hist = _running.get()
+    return hist.name if hist else None
+
+
+def handler_name(func) -> str:
+    return f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+
+def instrument_handler(callback, group: int):
+    """Wrap a pyrogram handler callback so every run is timed and counted."""
+    if not iscoroutinefunction(callback) or hasattr(callback, "__instrumented__"):
+        return callback
+    name = handler_name(callback)
+    hist = handlers.setdefault(name, Histogram(name))
+    group_hist = groups.setdefault(group, Histogram(f"group {group}"))
+
+    @wraps(callback)
+    async def timed(client, update, *args):
+        # The same update object goes through every group, count it once
+        if not getattr(update, "_counted", False):
+            try:
+                update._counted = True
+                totals["updates"] += 1
+            except AttributeError:
+                pass
+        token = _running.set(hist)
+        error = False
+        start = perf_counter()
+        try:
+            return await callback(client, update, *args)
+        except (StopPropagation, ContinuePropagation):
+            raise
+        except BaseException:
+            error = True
+            raise
+        finally:
+            elapsed = perf_counter() - start
+            _running.reset(token)
+            hist.observe(elapsed, error)
+            group_hist.observe(elapsed, error)
+
+    timed.__instrumented__ = True
+    return timed
+
+
+def slowest_handlers(limit: int = 10, by: str = "p95") -> List[tuple]:
+    rows = [(name, h.summary()) for name, h in handlers.items() if h.count]
+    rows.sort(key=lambda row: row[1][by], reverse=True)
+    return rows[:limit]
+
+
+def histogram_lines(metric: str, labels: str, hist: Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, n in zip(BUCKETS, hist.counts):
+        cumulative += n
+        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {hist.count}')
+    lines.append(f"{metric}_sum{{{labels}}} {hist.sum}")
+    lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+    return lines
+
+
+def render_prometheus() -> str:
+    """Prometheus text exposition of the handler metrics."""
+    lines = [
+        "# HELP misskaty_handler_seconds Handler run time.",
+        "# TYPE misskaty_handler_seconds histogram",
+    ]
+    for name, hist in handlers.items():
+        lines.extend(histogram_lines("misskaty_handler_seconds", f'handler="{name}"', hist))
+    lines += [
+        "# HELP misskaty_group_seconds Handler run time per handler group.",
+        "# TYPE misskaty_group_seconds histogram",
+    ]
+    for group, hist in groups.items():
+        lines.extend(histogram_lines("misskaty_group_seconds", f'group="{group}"', hist))
+    for kind in ("errors", "rpc", "mongo"):
+        metric = f"misskaty_handler_{kind}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.extend(
+            f'{metric}{{handler="{name}"}} {getattr(hist, kind)}'
+            for name, hist in handlers.items()
+        )
+    for key, value in totals.items():
+        lines.append(f"# TYPE misskaty_{key}_total counter")
+        lines.append(f"misskaty_{key}_total {value}")
+    for exporter in exporters:
+        lines.extend(exporter())
+    return "\n".join(lines) + "\n"
@@ -17,11 +17,12 @@
 # along with tgEasy.  If not, see <http://www.gnu.org/licenses/>.
 
 import typing
+from functools import wraps
 
 import pyrogram
 from pyrogram.methods import Decorators
 
-from ..utils import handle_error
+from ..utils import handle_error, self_member_cache
 
 
 def callback(
@@ -74,14 +75,11 @@ def callback(
         filtercb = pyrogram.filters.regex(f"^{data}.*")
 
     def wrapper(func):
+        @wraps(func)
         async def decorator(client, CallbackQuery: pyrogram.types.CallbackQuery):
             if self_admin:
-                me = await client.get_chat_member(
-                    CallbackQuery.message.chat.id, (await client.get_me()).id
-                )
-                if me.status not in (
-                    pyrogram.enums.ChatMemberStatus.OWNER,
-                    pyrogram.enums.ChatMemberStatus.ADMINISTRATOR,
+                if not await self_member_cache.is_admin(
+                    client, CallbackQuery.message.chat.id
                 ):
                     return await CallbackQuery.message.edit_text(
                         "I must be admin to execute this Command"
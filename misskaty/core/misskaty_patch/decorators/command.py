@@ -1,4 +1,5 @@
 import typing
+from functools import wraps
 
 import pyrogram
 from pyrogram.methods import Decorators
@@ -6,7 +7,7 @@ from pyrogram.methods import Decorators
 from misskaty.core import pyro_cooldown
 from misskaty.vars import COMMAND_HANDLER
 
-from ..utils import handle_error
+from ..utils import handle_error, self_member_cache
 
 
 def command(
@@ -60,31 +61,30 @@ def command(
     """
     if handler is None:
         handler = COMMAND_HANDLER
+    cooldown_name = f"cmd_{cmd if isinstance(cmd, str) else cmd[0]}"
     if filtercmd:
-        if self_only:
-            filtercmd = (
-                pyrogram.filters.command(cmd, prefixes=handler)
-                & filtercmd
-                & pyrogram.filters.me
-            )
-        else:
-            filtercmd = (
-                pyrogram.filters.command(cmd, prefixes=handler)
-                & filtercmd
-                & pyrogram.filters.me
-                & pyro_cooldown.wait(7)
-            )
+        filtercmd = (
+            pyrogram.filters.command(cmd, prefixes=handler)
+            & filtercmd
+            & pyrogram.filters.me
+        )
     else:
         if self_only:
             filtercmd = (
                 pyrogram.filters.command(cmd, prefixes=handler) & pyrogram.filters.me
             )
         else:
-            filtercmd = pyrogram.filters.command(
-                cmd, prefixes=handler
-            ) & pyro_cooldown.wait(7)
+            filtercmd = pyrogram.filters.command(cmd, prefixes=handler)
 
     def wrapper(func):
+        cmd_filter = filtercmd
+        if not self_only:
+            # Prefixed with the handler module, the same command in two plugins gets two limiters
+            cmd_filter = filtercmd & pyro_cooldown.wait(
+                7, f"{func.__module__}.{cooldown_name}"
+            )
+
+        @wraps(func)
         async def decorator(client, message: pyrogram.types.Message):
             if is_disabled:
                 return await message.reply_text(
@@ -99,13 +99,7 @@ def command(
                     "This command can be used in supergroups only."
                 )
             if self_admin:
-                me = await client.get_chat_member(
-                    message.chat.id, (await client.get_me()).id
-                )
-                if me.status not in (
-                    pyrogram.enums.ChatMemberStatus.OWNER,
-                    pyrogram.enums.ChatMemberStatus.ADMINISTRATOR,
-                ):
+                if not await self_member_cache.is_admin(client, message.chat.id):
                     return await message.reply_text(
                         "I must be admin to execute this Command"
                     )
@@ -123,7 +117,7 @@ def command(
                 return await handle_error(exception, message)
 
         self.add_handler(
-            pyrogram.handlers.MessageHandler(callback=decorator, filters=filtercmd)
+            pyrogram.handlers.MessageHandler(callback=decorator, filters=cmd_filter)
         )
         return decorator
 
@@ -1,4 +1,5 @@
 # skipcq
+from . import instrument
 from .edit_message_text import edit_message_text
 from .send_as_file import send_as_file
 from .send_message import send_message
@@ -0,0 +1,21 @@
+from pyrogram import Client
+
+from misskaty.core.metrics import count_rpc, instrument_handler
+
+_add_handler = Client.add_handler
+_invoke = Client.invoke
+
+
+def add_handler(self, handler, group: int = 0):
+    # Time every handler, the same handler object is kept so remove_handler still works
+    handler.callback = instrument_handler(handler.callback, group)
+    return _add_handler(self, handler, group)
+
+
+async def invoke(self, query, *args, **kwargs):
+    count_rpc()
+    return await _invoke(self, query, *args, **kwargs)
+
+
+Client.add_handler = add_handler
+Client.invoke = invoke
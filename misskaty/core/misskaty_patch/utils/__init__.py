@@ -2,4 +2,5 @@
 from .admin_utils import check_rights, is_admin
 from .get_user import get_user
 from .handler_error import handle_error
+from .self_member import SelfMember, privileges_set, self_member_cache
 from .utils import PyromodConfig, patch, patchable
@@ -0,0 +1,80 @@
+import asyncio
+import typing
+from time import monotonic
+
+import pyrogram
+from cachetools import LRUCache
+
+ADMIN_STATUS = (
+    pyrogram.enums.ChatMemberStatus.OWNER,
+    pyrogram.enums.ChatMemberStatus.ADMINISTRATOR,
+)
+
+
+def privileges_set(
+    privileges: typing.Optional[pyrogram.types.ChatPrivileges],
+) -> typing.FrozenSet[str]:
+    """Names of the ``can_*`` rights that are granted."""
+    if not privileges:
+        return frozenset()
+    return frozenset(
+        name
+        for name, value in vars(privileges).items()
+        if name.startswith("can_") and value is True
+    )
+
+
+class SelfMember:
+    """The bot's own status and privileges per chat.
+
+    Filled from my_chat_member updates and from the first lookup, then
+    served from memory. Entries older than ``refresh_after`` are still
+    returned while a background task fetches a fresh copy, so self_admin
+    checks normally don't wait on the network.
+    """
+
+    def __init__(self, refresh_after: int = 600, maxsize: int = 10000):
+        self.refresh_after = refresh_after
+        # chat_id -> (status, privileges, fetched_at)
+        self._cache = LRUCache(maxsize=maxsize)
+        self._refreshing = set()
+
+    def update(self, chat_id: int, member: pyrogram.types.ChatMember):
+        entry = (member.status, privileges_set(member.privileges), monotonic())
+        self._cache[chat_id] = entry
+        return entry
+
+    def forget(self, chat_id: int):
+        self._cache.pop(chat_id, None)
+
+    async def _fetch(self, client: pyrogram.Client, chat_id: int):
+        return self.update(chat_id, await client.get_chat_member(chat_id, client.me.id))
+
+    async def _refresh(self, client: pyrogram.Client, chat_id: int):
+        try:
+            await self._fetch(client, chat_id)
+        except pyrogram.errors.RPCError:
+            # Kicked or chat gone, ask again on the next command
+            self.forget(chat_id)
+        finally:
+            self._refreshing.discard(chat_id)
+
+    async def get(
+        self, client: pyrogram.Client, chat_id: int
+    ) -> typing.Tuple[pyrogram.enums.ChatMemberStatus, typing.FrozenSet[str]]:
+        entry = self._cache.get(chat_id)
+        if entry is None:
+            entry = await self._fetch(client, chat_id)
+        elif (
+            monotonic() - entry[2] > self.refresh_after
+            and chat_id not in self._refreshing
+        ):
+            self._refreshing.add(chat_id)
+            asyncio.create_task(self._refresh(client, chat_id))
+        return entry[0], entry[1]
+
+    async def is_admin(self, client: pyrogram.Client, chat_id: int) -> bool:
+        return (await self.get(client, chat_id))[0] in ADMIN_STATUS
+
+
+self_member_cache = SelfMember()
@@ -1,51 +1,48 @@
 import asyncio
 
-from pyrogram import filters
+from pyrogram import enums, filters
 from pyrogram.errors import MessageDeleteForbidden
 
+from misskaty.core.ratelimit import RateLimiter, hit_all, limiters
 from misskaty.vars import SUDO, OWNER_ID
 
-data = {}
+# Shared by every command, stops one group from flooding the bot
+chat_limiter = RateLimiter("chat_commands", capacity=20, period=60)
 
 
-async def task(msg, warn=False, sec=None):
-    if warn:
-        user = msg.from_user or msg.sender_chat
-        ids = await msg.reply_msg(
-            f"Sorry {user.mention if msg.from_user else msg.sender_chat.title} [<code>{user.id}</code>], you must wait for {sec}s before using this feature again.."
-        )
-        try:
-            await msg.delete_msg()
-        except MessageDeleteForbidden:
-            pass
-        await asyncio.sleep(sec)
-        await ids.edit_msg(
-            f"Alright {user.mention if msg.from_user else msg.sender_chat.title} [<code>{user.id}</code>], your cooldown is over you can command again.",
-            del_in=3,
-        )
+async def task(msg, sec):
+    user = msg.from_user or msg.sender_chat
+    ids = await msg.reply_msg(
+        f"Sorry {user.mention if msg.from_user else msg.sender_chat.title} [<code>{user.id}</code>], you must wait for {sec}s before using this feature again.."
+    )
+    try:
+        await msg.delete_msg()
+    except MessageDeleteForbidden:
+        pass
+    await asyncio.sleep(sec)
+    await ids.edit_msg(
+        f"Alright {user.mention if msg.from_user else msg.sender_chat.title} [<code>{user.id}</code>], your cooldown is over you can command again.",
+        del_in=3,
+    )
 
 
-def wait(sec):
+def wait(sec, name=None):
+    """Allow one use per ``sec`` seconds for each user, a new bucket per call site."""
+    limiter = RateLimiter(name or f"cooldown_{len(limiters)}", capacity=1, period=sec)
+
     async def ___(flt, _, msg):
         user_id = msg.from_user.id if msg.from_user else msg.sender_chat.id
         if user_id in SUDO or user_id == OWNER_ID:
             return True
-        if user_id in data:
-            if msg.date.timestamp() >= data[user_id]["timestamp"] + flt.data:
-                data[user_id] = {"timestamp": msg.date.timestamp(), "warned": False}
-                return True
-            else:
-                if not data[user_id]["warned"]:
-                    data[user_id]["warned"] = True
-                    asyncio.ensure_future(
-                        task(msg, True, flt.data)
-                    )  # for super accuracy use (future - time.time())
-                    return False  # cause we dont need delete again
-
-                asyncio.ensure_future(task(msg))
-                return False
-        else:
-            data.update({user_id: {"timestamp": msg.date.timestamp(), "warned": False}})
+        checks = [(flt.limiter, user_id)]
+        if msg.chat.type != enums.ChatType.PRIVATE:
+            checks.insert(0, (chat_limiter, msg.chat.id))
+        limiter, delay = hit_all(*checks)
+        if limiter is None:
             return True
+        # Only the first throttled message of a user's flood gets a reply
+        if limiter is flt.limiter and flt.limiter.should_warn(user_id):
+            asyncio.ensure_future(task(msg, round(delay) or 1))
+        return False
 
-    return filters.create(___, data=sec)
+    return filters.create(___, data=sec, limiter=limiter)
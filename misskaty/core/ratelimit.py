@@ -0,0 +1,114 @@
+from time import monotonic
+from typing import Dict, Hashable, Optional, Tuple
+
+from cachetools import TTLCache
+
+__all__ = ["RateLimiter", "hit_all", "limiters"]
+
+# name -> RateLimiter, used to show throttle counters
+limiters: Dict[str, "RateLimiter"] = {}
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "warned")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+        self.warned = False
+
+
+class RateLimiter:
+    """Token bucket per key (user, chat, ...).
+
+    ``capacity`` tokens are available at once and refill at ``capacity / period``
+    per second. Buckets untouched for ``period`` seconds are full again anyway,
+    so they expire from the cache instead of living forever.
+
+    With ``refill=False`` it is a fixed quota instead: used tokens only come
+    back through :meth:`reset` (or once a bucket sat idle for ``period``).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        period: float,
+        maxsize: int = 10000,
+        refill: bool = True,
+    ):
+        self.name = name
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.refill = refill
+        self._buckets = TTLCache(maxsize=maxsize, ttl=period)
+        self.allowed = 0
+        self.throttled = 0
+        self.warned = 0
+        limiters[name] = self
+
+    def _refill(self, key: Hashable, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(self.capacity, now)
+        elif self.refill:
+            bucket.tokens = min(
+                self.capacity, bucket.tokens + (now - bucket.updated) * self.rate
+            )
+            bucket.updated = now
+        # Re-set to push the idle expiry forward
+        self._buckets[key] = bucket
+        return bucket
+
+    def hit(self, key: Hashable) -> float:
+        """Take one token. Return 0 if allowed, else seconds until the next token."""
+        return hit_all((self, key))[1]
+
+    def should_warn(self, key: Hashable) -> bool:
+        """True only for the first throttled hit of a flood, so one reply is sent."""
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.warned:
+            return False
+        bucket.warned = True
+        self.warned += 1
+        return True
+
+    def remaining(self, key: Hashable) -> int:
+        return int(self._refill(key, monotonic()).tokens)
+
+    def reset(self, key: Optional[Hashable] = None):
+        if key is None:
+            self._buckets.clear()
+        else:
+            self._buckets.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._buckets),
+            "allowed": self.allowed,
+            "throttled": self.throttled,
+            "warned": self.warned,
+        }
+
+
+def hit_all(
+    *checks: Tuple[RateLimiter, Hashable]
+) -> Tuple[Optional[RateLimiter], float]:
+    """Take one token from every ``(limiter, key)`` only if all of them have one.
+
+    Return ``(None, 0)`` if allowed, else the first limiter without a token and
+    the seconds until its next one. A throttled call takes nothing, so being
+    stopped by one bucket doesn't drain the others.
+    """
+    now = monotonic()
+    buckets = [(limiter, limiter._refill(key, now)) for limiter, key in checks]
+    for limiter, bucket in buckets:
+        if bucket.tokens < 1:
+            limiter.throttled += 1
+            return limiter, (1 - bucket.tokens) / limiter.rate
+    for limiter, bucket in buckets:
+        bucket.tokens -= 1
+        bucket.warned = False
+        limiter.allowed += 1
+    return None, 0
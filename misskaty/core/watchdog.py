@@ -0,0 +1,105 @@
+import asyncio
+import os
+import sys
+import threading
+from collections import Counter, deque
+from logging import getLogger
+from time import monotonic, sleep, time
+from traceback import extract_stack, format_list
+from typing import Optional
+
+__all__ = ["LoopWatchdog", "watchdog"]
+
+LOGGER = getLogger("MissKaty")
+# Frames under the project root count as the offender, library frames are skipped
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+class LoopWatchdog:
+    """Measure event loop lag and catch whatever is blocking it.
+
+    A coroutine sleeps ``interval`` seconds in a loop and records how late it
+    wakes up. A daemon thread checks that heartbeat; once the loop has been
+    stuck for longer than ``threshold`` it grabs the stack of the loop thread,
+    so the blocking call shows up while it is still running.
+    """
+
+    def __init__(
+        self, interval: float = 0.5, threshold: float = 0.3, samples: int = 20
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags = deque(maxlen=600)
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.offenders = Counter()
+        self.samples = deque(maxlen=samples)
+        self._beat = monotonic()
+        self._loop_thread: Optional[int] = None
+        self._captured_beat = None
+
+    async def run(self):
+        self._loop_thread = threading.get_ident()
+        threading.Thread(
+            target=self._sampler, name="loop-watchdog", daemon=True
+        ).start()
+        while True:
+            self._beat = monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, monotonic() - self._beat - self.interval)
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self.stalls += 1
+
+    def _sampler(self):
+        while True:
+            sleep(self.threshold / 2)
+            beat = self._beat
+            stuck = monotonic() - beat - self.interval
+            # One capture per stall, the heartbeat value identifies it
+            if stuck < self.threshold or beat == self._captured_beat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            self._captured_beat = beat
+            stack = extract_stack(frame)
+            del frame
+            self._record(stack, stuck)
+
+    def _record(self, stack, stuck: float):
+        own = [
+            f
+            for f in stack
+            if f.filename.startswith(PROJECT_ROOT) and "site-packages" not in f.filename
+        ]
+        culprit = (own or stack)[-1]
+        path = os.path.relpath(culprit.filename, PROJECT_ROOT)
+        location = f"{path}:{culprit.lineno} in {culprit.name}"
+        self.offenders[location] += 1
+        self.samples.append(
+            {
+                "time": time(),
+                "blocked_ms": round(stuck * 1000),
+                "location": location,
+                "stack": "".join(format_list(stack[-12:])),
+            }
+        )
+        LOGGER.warning(f"Event loop blocked for {stuck * 1000:.0f}ms at {location}")
+
+    def stats(self, top: int = 10) -> dict:
+        lags = sorted(self.lags)
+        p95 = lags[int(len(lags) * 0.95)] if lags else 0.0
+        return {
+            "lag_ms": round(self.lags[-1] * 1000, 1) if self.lags else 0.0,
+            "p95_ms": round(p95 * 1000, 1),
+            "max_ms": round(self.max_lag * 1000, 1),
+            "stalls": self.stalls,
+            "offenders": dict(self.offenders.most_common(top)),
+        }
+
+
+watchdog = LoopWatchdog()
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from re import compile as re_compile
 from re import findall
 from re import sub as re_sub
 from string import ascii_lowercase
@@ -9,12 +10,19 @@ from pyrogram.types import Message
 from misskaty import app
 
 
-def get_urls_from_text(text: str) -> bool:
-    regex = r"""(?i)\b((?:https?://|www\d{0,3}[.]|[a-z0-9.\-]
+URL_REGEX = re_compile(
+    r"""(?i)\b((?:https?://|www\d{0,3}[.]|[a-z0-9.\-]
                 [.][a-z]{2,4}/)(?:[^\s()<>]+|\(([^\s()<>]+|(
                 \([^\s()<>]+\)))*\))+(?:\(([^\s()<>]+|(\([^\
                 ()<>]+\)))*\)|[^\s`!()\[\]{};:'".,<>?«»“”‘’]))""".strip()
-    return [x[0] for x in findall(regex, text)]
+)
+
+
+def get_urls_from_text(text: str) -> bool:
+    # Every branch of URL_REGEX needs "://" or a dot, skip the regex otherwise
+    if "." not in text and "://" not in text:
+        return []
+    return [x[0] for x in URL_REGEX.findall(text)]
 
 
 def extract_urls(reply_markup):
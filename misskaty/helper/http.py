@@ -1,42 +1,164 @@
-from asyncio import gather
-from httpx import AsyncClient, Timeout
+from asyncio import Semaphore, gather
+from collections import defaultdict
+from importlib.util import find_spec
+from time import perf_counter
+from typing import Dict, List
+
+from httpx import AsyncClient, Limits, Timeout
+
+from misskaty.core.metrics import exporters
+
+# Requests in flight per host, a slow site queues on its own limit instead of draining the pool
+DEFAULT_HOST_CONCURRENCY = 10
+HOST_CONCURRENCY: Dict[str, int] = {
+    "v3.sg.media-imdb.com": 20,
+    "www.imdb.com": 10,
+    "yasirapi.eu.org": 8,
+    "v2.yasirapi.eu.org": 8,
+}
+
+
+class HostStats:
+    __slots__ = ("requests", "errors", "in_flight", "peak", "queued", "wait")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.queued = 0
+        self.wait = 0.0
+
+
+class FetchClient(AsyncClient):
+    """Shared AsyncClient with HTTP/2 and a concurrency limit per host.
+
+    Every request goes through ``send``, which waits on the semaphore of
+    the target host first. Requests that had to wait and the time they
+    waited are counted per host, next to the overall pool usage, so a
+    saturated host or pool shows up in /status and /metrics.
+    """
+
+    def __init__(self, *args, max_connections: int = 100, **kwargs):
+        super().__init__(
+            *args,
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=40,
+                keepalive_expiry=30,
+            ),
+            **kwargs,
+        )
+        self.http2 = kwargs.get("http2", False)
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self._limiters: Dict[str, Semaphore] = {}
+        self._hosts: Dict[str, HostStats] = defaultdict(HostStats)
+
+    def _limiter(self, host: str) -> Semaphore:
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = Semaphore(
+                HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY)
+            )
+        return limiter
+
+    async def send(self, request, *args, **kwargs):
+        host = request.url.host
+        stats = self._hosts[host]
+        limiter = self._limiter(host)
+        stats.requests += 1
+        if limiter.locked():
+            stats.queued += 1
+        start = perf_counter()
+        async with limiter:
+            stats.wait += perf_counter() - start
+            stats.in_flight += 1
+            stats.peak = max(stats.peak, stats.in_flight)
+            self.in_flight += 1
+            try:
+                return await super().send(request, *args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.in_flight -= 1
+                self.in_flight -= 1
+
+    def stats(self, top: int = 10) -> dict:
+        busiest = sorted(self._hosts.items(), key=lambda item: item[1].requests, reverse=True)
+        return {
+            "http2": self.http2,
+            "in_flight": self.in_flight,
+            "pool_saturation": round(self.in_flight / self.max_connections, 3),
+            "hosts": {
+                host: {
+                    "requests": s.requests,
+                    "errors": s.errors,
+                    "in_flight": s.in_flight,
+                    "peak": s.peak,
+                    "limit": HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY),
+                    "queued": s.queued,
+                    "avg_wait_ms": round(s.wait / s.requests * 1000, 1),
+                }
+                for host, s in busiest[:top]
+            },
+        }
+
+    def prometheus_lines(self) -> List[str]:
+        lines = [
+            "# TYPE misskaty_http_in_flight gauge",
+            f"misskaty_http_in_flight {self.in_flight}",
+            "# TYPE misskaty_http_pool_saturation gauge",
+            f"misskaty_http_pool_saturation {self.in_flight / self.max_connections}",
+        ]
+        for metric, attr in (
+            ("requests_total", "requests"),
+            ("errors_total", "errors"),
+            ("queued_total", "queued"),
+            ("wait_seconds_total", "wait"),
+            ("host_in_flight", "in_flight"),
+        ):
+            kind = "gauge" if metric == "host_in_flight" else "counter"
+            lines.append(f"# TYPE misskaty_http_{metric} {kind}")
+            lines.extend(
+                f'misskaty_http_{metric}{{host="{host}"}} {getattr(s, attr)}'
+                for host, s in self._hosts.items()
+            )
+        return lines
+
 
 # HTTPx Async Client
-fetch = AsyncClient(
+fetch = FetchClient(
     verify=False,
     headers={
         "Accept-Language": "en-US,en;q=0.9,id-ID;q=0.8,id;q=0.7",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/107.0.0.0 Safari/537.36 Edge/107.0.1418.42",
     },
     timeout=Timeout(20),
+    # Negotiated through ALPN, servers without HTTP/2 keep using HTTP/1.1
+    http2=find_spec("h2") is not None,
 )
+exporters.append(fetch.prometheus_lines)
 
 
-async def get(url: str, *args, **kwargs):
+def _body(resp):
     try:
-        resp = await fetch.get(url, *args, **kwargs)
-        data = await resp.json()
-    except Exception:
-        data = await resp.text()
-    return data
+        return resp.json()
+    except ValueError:
+        return resp.text
+
+
+async def get(url: str, *args, **kwargs):
+    return _body(await fetch.get(url, *args, **kwargs))
 
 
 async def head(url: str, *args, **kwargs):
-    try:
-        resp = await fetch.head(url, *args, **kwargs)
-        data = await resp.json()
-    except Exception:
-        data = await resp.text()
-    return data
+    return _body(await fetch.head(url, *args, **kwargs))
 
 
 async def post(url: str, *args, **kwargs):
-    try:
-        resp = await fetch.post(url, *args, **kwargs)
-        data = await resp.json()
-    except Exception:
-        data = await resp.text()
-    return data
+    return _body(await fetch.post(url, *args, **kwargs))
 
 
 async def multiget(url: str, times: int, *args, **kwargs):
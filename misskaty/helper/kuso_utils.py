@@ -10,10 +10,12 @@ from telegraph.aio import Telegraph
 from misskaty import BOT_USERNAME
 from misskaty.helper.http import fetch
 from misskaty.helper.media_helper import post_to_telegraph
+from misskaty.helper.sqlite_helper import memo_cache
 
 LOGGER = logging.getLogger("MissKaty")
 
 
+@memo_cache.memoize(timeout=6 * 60 * 60)
 async def kusonimeBypass(url: str):
     result = {}
     page = await fetch.get(url)
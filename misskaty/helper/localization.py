@@ -1,14 +1,14 @@
-import inspect
 import json
 import os.path
-from functools import partial, wraps
+from functools import lru_cache, wraps
 from glob import glob
 from typing import Dict, List
 
 from pyrogram.enums import ChatType
 from pyrogram.types import CallbackQuery, ChatMemberUpdated, InlineQuery, Message
 
-from database.locale_db import get_db_lang
+from database.chat_state import get_chat_state
+from database.locale_db import get_db_lang, group_types
 
 enabled_locales: List[str] = [
     # "en-GB",  # English (United Kingdom)
@@ -32,27 +32,77 @@ def cache_localizations(files: List[str]) -> Dict[str, Dict[str, Dict[str, str]]
     return ldict
 
 
+def compile_localizations(
+    ldict: Dict[str, Dict[str, Dict[str, str]]]
+) -> Dict[str, Dict[str, Dict[str, str]]]:
+    # Flatten every (lang, context) table with the default language merged in,
+    # so a lookup never has to fall back at runtime. Empty strings fall back too.
+    default = ldict[default_language]
+    compiled = {}
+    for lang, contexts in ldict.items():
+        compiled[lang] = {}
+        for context in set(default) | set(contexts):
+            table = {k: v for k, v in default.get(context, {}).items() if v}
+            table.update({k: v for k, v in contexts.get(context, {}).items() if v})
+            compiled[lang][context] = table
+    return compiled
+
+
 jsons: List[str] = []
 
 for locale in enabled_locales:
     jsons += glob(os.path.join("locales", locale, "*.json"))
 
-langdict = cache_localizations(jsons)
+langdict = compile_localizations(cache_localizations(jsons))
+
+
+class LocaleStrings:
+    """``strings(key)`` callable bound to one compiled (lang, context) table."""
+
+    __slots__ = ("lang", "table")
+
+    def __init__(self, lang: str, context: str):
+        self.lang = lang
+        self.table = langdict[lang].get(context, {})
+
+    def __call__(self, key: str, context: str = None) -> str:
+        if context:
+            return langdict[self.lang][context].get(key, key)
+        return self.table.get(key, key)
+
+
+@lru_cache(maxsize=None)
+def get_strings(lang: str, context: str) -> LocaleStrings:
+    return LocaleStrings(lang if lang in langdict else default_language, context)
 
 
 def get_locale_string(
     dic: dict, language: str, default_context: str, key: str, context: str = None
 ) -> str:
     if context:
-        default_context = context
-        dic = langdict[language].get(context, langdict[default_language][context])
-    res: str = (
-        dic.get(key) or langdict[default_language][default_context].get(key) or key
-    )
-    return res
+        dic = langdict[language][context]
+    return dic.get(key, key)
+
+
+@lru_cache(maxsize=512)
+def normalize_lang(lang: str) -> str:
+    # User has a language_code without hyphen
+    if len(lang.split("-")) == 1:
+        # Try to find a language that starts with the provided language_code
+        for locale_ in enabled_locales:
+            if locale_.startswith(lang):
+                lang = locale_
+    elif lang.split("-")[1].islower():
+        lang = lang.split("-")
+        lang[1] = lang[1].upper()
+        lang = "-".join(lang)
+    return lang if lang in enabled_locales else default_language
 
 
 async def get_lang(message) -> str:
+    # Same update object is passed to every handler group, resolve it once
+    if lang := getattr(message, "_resolved_lang", None):
+        return lang
     if isinstance(message, CallbackQuery):
         chat = message.message.chat
     elif isinstance(message, (Message, ChatMemberUpdated)):
@@ -62,45 +112,30 @@ async def get_lang(message) -> str:
     else:
         raise TypeError(f"Update type '{message.__name__}' is not supported.")
 
-    lang = await get_db_lang(chat.id)
+    if isinstance(message, (Message, ChatMemberUpdated)) and chat.type in group_types:
+        # Group handlers share one ChatState per update, read the locale from it
+        lang = (await get_chat_state(message)).lang
+    else:
+        lang = await get_db_lang(chat.id)
 
     if chat.type == ChatType.PRIVATE:
         lang = lang or message.from_user.language_code or default_language
     else:
         lang = lang or default_language
-    # User has a language_code without hyphen
-    if len(lang.split("-")) == 1:
-        # Try to find a language that starts with the provided language_code
-        for locale_ in enabled_locales:
-            if locale_.startswith(lang):
-                lang = locale_
-    elif lang.split("-")[1].islower():
-        lang = lang.split("-")
-        lang[1] = lang[1].upper()
-        lang = "-".join(lang)
-    return lang if lang in enabled_locales else default_language
+    lang = normalize_lang(lang)
+    message._resolved_lang = lang
+    return lang
 
 
 def use_chat_lang(context: str = None):
-    if not context:
-        cwd = os.getcwd()
-        frame = inspect.stack()[1]
-
-        fname = frame.filename
-
-        if fname.startswith(cwd):
-            fname = fname[len(cwd) + 1 :]
-        context = fname.split(os.path.sep)[2].split(".")[0]
-
     def decorator(func):
+        # Plugin module name is the locale context, e.g. misskaty.plugins.afk -> afk
+        ctx = context or func.__module__.rsplit(".", 1)[-1]
+
         @wraps(func)
         async def wrapper(client, message):
             lang = await get_lang(message)
-
-            dic = langdict.get(lang, langdict[default_language])
-
-            lfunc = partial(get_locale_string, dic.get(context, {}), lang, context)
-            return await func(client, message, lfunc)
+            return await func(client, message, get_strings(lang, ctx))
 
         return wrapper
 
@@ -1,18 +1,139 @@
+import asyncio
+import json
 import os
 import pickle
+import re
 import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from datetime import datetime, timedelta, timezone
-from functools import wraps
+from functools import partial, wraps
+from logging import getLogger
+from math import ceil
 from pathlib import Path
-from threading import local
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+from threading import Lock, local
+from time import time
+from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional, Tuple
+from weakref import WeakSet
+
+__all__ = [
+    "AsyncCache",
+    "Cache",
+    "PagedCache",
+    "cache_stats",
+    "cache_sweeper",
+    "memo_cache",
+]
+
+LOGGER = getLogger("MissKaty")
+_MISSING = object()
+# Every open Cache, walked by cache_sweeper
+_instances: "WeakSet[Cache]" = WeakSet()
+# connection string -> connection, one per thread and database shared by its namespaces
+_connections = local()
+# File based caches become tables of this database in their path
+SHARED_DATABASE = "misskaty_cache.db"
+# Per namespace defaults, arguments given to Cache() take precedence
+NAMESPACES: Dict[str, Dict[str, Any]] = {
+    "admin_cache": {"default_timeout": 6 * 60 * 60, "max_rows": 20000},
+    "scraper_cache": {"default_timeout": 30 * 60, "max_bytes": 64 * 1024 * 1024},
+    "kuso_cache": {"default_timeout": 24 * 60 * 60, "max_rows": 5000},
+    "imdb_cache": {"default_timeout": 60, "max_rows": 5000},
+    "pypi_cache": {"default_timeout": 30 * 60, "max_bytes": 16 * 1024 * 1024},
+    "memo_cache": {"default_timeout": 60 * 60, "max_bytes": 32 * 1024 * 1024},
+}
+
+
+def _remove_legacy_file(filepath: str) -> None:
+    """Delete the own database file a namespace used before the shared one existed."""
+    for suffix in ("", "-wal", "-shm"):
+        with suppress(FileNotFoundError):
+            os.remove(f"{filepath}{suffix}")
+            if not suffix:
+                LOGGER.info(f"Removed {filepath}, it is a table of {SHARED_DATABASE} now")
+
+
+class _Failure(NamedTuple):
+    """An exception remembered by memoize, raised again as a new instance on every hit."""
+
+    type: type
+    args: tuple
+    attrs: dict
+
+    @classmethod
+    def of(cls, exc: BaseException) -> "_Failure":
+        return cls(type(exc), exc.args, dict(vars(exc)))
+
+    def exception(self) -> BaseException:
+        # __new__ skips __init__, whose signature need not match args (e.g. httpx errors)
+        exc = self.type.__new__(self.type, *self.args)
+        exc.args = self.args
+        exc.__dict__.update(self.attrs)
+        return exc
+
+
+class _MemoryTier:
+    """Bounded LRU of already unpickled values in front of the SQLite file.
+
+    Entries keep the same expiry as the row they mirror, ``ttl`` can cap it
+    further so long lived rows are re-read from disk once in a while.
+    Keys are stored as ``str`` because the SQLite key column is TEXT.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Any) -> Any:
+        key = str(key)
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and (item[1] == -1.0 or item[1] > time()):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return _MISSING
+
+    def put(self, key: Any, value: Any, exp: float) -> None:
+        if self.ttl is not None:
+            cap = time() + self.ttl
+            exp = cap if exp == -1.0 else min(exp, cap)
+        key = str(key)
+        with self._lock:
+            self._data[key] = (value, exp)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(str(key), None)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._data)
 
-__all__ = ["Cache"]
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
 
 
 class Cache:
-    """Simple SQLite Cache."""
+    """Simple SQLite Cache.
+
+    With the memory tier on (``memory_size`` > 0, the default) a hit returns
+    the very object that was stored or last read, not a fresh unpickled copy.
+    Returned values must not be mutated; use ``memory_size=0`` for a cache
+    whose callers need their own copy.
+    """
 
     PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
     DEFAULT_TIMEOUT = 300
@@ -20,7 +141,7 @@ class Cache:
         "mmap_size": 2**26,  # https://www.sqlite.org/pragma.html#pragma_mmap_size
         "cache_size": 8192,  # https://www.sqlite.org/pragma.html#pragma_cache_size
         "wal_autocheckpoint": 1000,  # https://www.sqlite.org/pragma.html#pragma_wal_autocheckpoint
-        "auto_vacuum": "none",  # https://www.sqlite.org/pragma.html#pragma_auto_vacuum
+        "auto_vacuum": "incremental",  # https://www.sqlite.org/pragma.html#pragma_auto_vacuum
         "synchronous": "off",  # https://www.sqlite.org/pragma.html#pragma_synchronous
         "journal_mode": "wal",  # https://www.sqlite.org/pragma.html#pragma_journal_mode
         "temp_store": "file",  # https://www.sqlite.org/pragma.html#pragma_temp_store
@@ -28,49 +149,67 @@ class Cache:
 
     _transaction_sql = "BEGIN EXCLUSIVE TRANSACTION; {} COMMIT TRANSACTION;"
 
-    _create_sql = "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, exp FLOAT);"
+    _create_sql = (
+        "CREATE TABLE IF NOT EXISTS cache "
+        "(key TEXT PRIMARY KEY, value BLOB, exp FLOAT, atime FLOAT DEFAULT 0);"
+    )
     _create_index_sql = "CREATE UNIQUE INDEX IF NOT EXISTS cache_key ON cache(key);"
+    _create_exp_index_sql = "CREATE INDEX IF NOT EXISTS cache_exp ON cache(exp);"
+    _create_atime_index_sql = "CREATE INDEX IF NOT EXISTS cache_atime ON cache(atime);"
+    _columns_sql = "PRAGMA table_info(cache);"
+    _add_atime_sql = "ALTER TABLE cache ADD COLUMN atime FLOAT DEFAULT 0;"
     _set_pragma = "PRAGMA {};"
     _set_pragma_equal = "PRAGMA {}={};"
 
+    # Expiry is compared as plain epoch floats so the exp index can be used
     _add_sql = (
-        "INSERT INTO cache (key, value, exp) VALUES (:key, :value, :exp) "
-        "ON CONFLICT(key) DO UPDATE SET value = :value, exp = :exp "
-        "WHERE (exp <> -1.0 AND DATETIME(exp, 'unixepoch') <= DATETIME('now'));"
+        "INSERT INTO cache (key, value, exp, atime) VALUES (:key, :value, :exp, :now) "
+        "ON CONFLICT(key) DO UPDATE SET value = :value, exp = :exp, atime = :now "
+        "WHERE (exp <> -1.0 AND exp <= :now);"
     )
     _get_sql = "SELECT value, exp FROM cache WHERE key = :key;"
     _set_sql = (
-        "INSERT INTO cache (key, value, exp) VALUES (:key, :value, :exp) "
-        "ON CONFLICT(key) DO UPDATE SET value = :value, exp = :exp;"
+        "INSERT INTO cache (key, value, exp, atime) VALUES (:key, :value, :exp, :now) "
+        "ON CONFLICT(key) DO UPDATE SET value = :value, exp = :exp, atime = :now;"
     )
     _check_sql = (
         "SELECT value, exp FROM cache WHERE key = :key "
-        "AND (exp = -1.0 OR DATETIME(exp, 'unixepoch') > DATETIME('now'));"
+        "AND (exp = -1.0 OR exp > :now);"
     )
     _update_sql = (
-        "UPDATE cache SET value = :value WHERE key = :key "
-        "AND (exp = -1.0 OR DATETIME(exp, 'unixepoch') > DATETIME('now'));"
+        "UPDATE cache SET value = :value, atime = :now WHERE key = :key "
+        "AND (exp = -1.0 OR exp > :now);"
     )
 
     # TODO: add 'RETURNING COUNT(*)!=0' to these when sqlite3 version >=3.35.0
     _delete_sql = "DELETE FROM cache WHERE key = :key;"
     _touch_sql = (
-        "UPDATE cache SET exp = :exp WHERE key = :key "
-        "AND (exp = -1.0 OR DATETIME(exp, 'unixepoch') > DATETIME('now'));"
+        "UPDATE cache SET exp = :exp, atime = :now WHERE key = :key "
+        "AND (exp = -1.0 OR exp > :now);"
     )
     _clear_sql = "DELETE FROM cache;"
 
     _add_many_sql = (
-        "INSERT INTO cache (key, value, exp) VALUES {}"
-        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp "
-        "WHERE (exp <> -1.0 AND DATETIME(exp, 'unixepoch') <= DATETIME('now'));"
+        "INSERT INTO cache (key, value, exp, atime) VALUES {}"
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp, "
+        "atime = excluded.atime WHERE (exp <> -1.0 AND exp <= :now);"
     )
     _get_many_sql = "SELECT key, value, exp FROM cache WHERE key IN ({});"
     _set_many_sql = (
-        "INSERT INTO cache (key, value, exp) VALUES {}"
-        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp;"
+        "INSERT INTO cache (key, value, exp, atime) VALUES {}"
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp, "
+        "atime = excluded.atime;"
     )
     _delete_many_sql = "DELETE FROM cache WHERE key IN ({});"
+    _get_all_sql = "SELECT key, value FROM cache;"
+
+    # Range scan on the exp index, rows that never expire (-1.0) are outside it
+    _expired_sql = (
+        "SELECT key FROM cache WHERE exp >= 0 AND exp <= :now LIMIT :batch;"
+    )
+    _lru_sql = "SELECT key FROM cache ORDER BY atime LIMIT :batch;"
+    _atime_sql = "UPDATE cache SET atime = :now WHERE key = :key;"
+    _size_sql = "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache;"
 
     def __init__(
         self,
@@ -82,6 +221,14 @@ class Cache:
         isolation_level: Optional[
             Literal["DEFERRED", "IMMEDIATE", "EXCLUSIVE"]
         ] = "DEFERRED",
+        memory_size: int = 1024,
+        memory_ttl: Optional[int] = None,
+        write_behind: bool = False,
+        write_behind_batch: int = 100,
+        max_rows: Optional[int] = _MISSING,
+        max_bytes: Optional[int] = _MISSING,
+        default_timeout: int = _MISSING,
+        shared: bool = True,
         **kwargs,
     ):
         """Create a cache using sqlite3.
@@ -93,37 +240,91 @@ class Cache:
         :param isolation_level: Controls the transaction handling performed by sqlite3.
                                 If set to None, transactions are never implicitly opened.
                                 https://www.sqlite.org/lang_transaction.html
+        :param memory_size: Keep up to this many unpickled values in memory, shared by every reader.
+                            0 disables the memory tier.
+        :param memory_ttl: Re-read values from disk after this many seconds even if they have not expired.
+        :param write_behind: Queue ``set`` calls and write them in one transaction per ``write_behind_batch``
+                             items or on :meth:`flush`, instead of committing every call.
+        :param write_behind_batch: Pending writes that trigger a flush.
+        :param max_rows: Evict the least recently used rows above this many on :meth:`sweep`.
+        :param max_bytes: Evict the least recently used rows while their values take more than this.
+        :param default_timeout: Timeout used when a method is called without one.
+        :param shared: Store a file based cache as the namespace ``filename`` without its
+                       extension in the shared database of ``path``, instead of its own file.
         :param kwargs: Pragma settings. https://www.sqlite.org/pragma.html
         """
 
+        self.namespace = re.sub(r"\W", "_", Path(filename).stem) or "cache"
+        self.shared = shared and not in_memory
+        if self.shared:
+            if filename != SHARED_DATABASE:
+                _remove_legacy_file(filename if path is None else str(Path(path) / filename))
+            filename = SHARED_DATABASE
+            # Every statement names the namespace table instead of "cache"
+            table = f"ns_{self.namespace}"
+            for name in dir(type(self)):
+                if name.endswith("_sql"):
+                    setattr(self, name, getattr(self, name).replace("cache", table))
+        policy = NAMESPACES.get(self.namespace, {}) if self.shared else {}
+        if max_rows is _MISSING:
+            max_rows = policy.get("max_rows")
+        if max_bytes is _MISSING:
+            max_bytes = policy.get("max_bytes")
+        if default_timeout is _MISSING:
+            default_timeout = policy.get("default_timeout", self.DEFAULT_TIMEOUT)
+
         filepath = filename if path is None else str(Path(path) / filename)
         suffix = ":?mode=memory&cache=shared" if in_memory else ""
         self.connection_string = f"{filepath}{suffix}"
         self.pragma = {**kwargs, **self.DEFAULT_PRAGMA}
         self.timeout = timeout
+        self.default_timeout = default_timeout
         self.path = path
         self.isolation_level = isolation_level
-        self.local = local()
-        self.local.instances = getattr(self.local, "instances", 0) + 1
+        self._memory = _MemoryTier(memory_size, memory_ttl) if memory_size > 0 else None
+        self.write_behind = write_behind
+        self.write_behind_batch = write_behind_batch
+        # str(key) -> (key, value, exp) not written to SQLite yet
+        self._pending: Dict[str, Tuple[Any, Any, float]] = {}
+        self._pending_lock = Lock()
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        # Keys read from disk since the last sweep, their atime is bumped in one go
+        self._touched = set()
+        # Thread that sweeps this cache, None for the default executor
+        self._executor = None
+        # Totals of the sweeps, and rows and value bytes as of the last one
+        self.sweeps = {"expired": 0, "evicted": 0, "rows": 0, "bytes": 0}
+        # function name -> counters of AsyncCache.memoize wrappers on this cache
+        self.memoized: Dict[str, Dict[str, int]] = {}
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
 
         self._con.execute(self._create_sql)
+        if "atime" not in {row[1] for row in self._con.execute(self._columns_sql)}:
+            # Files written before LRU eviction existed
+            self._con.execute(self._add_atime_sql)
         self._con.execute(self._create_index_sql)
+        self._con.execute(self._create_exp_index_sql)
+        self._con.execute(self._create_atime_index_sql)
         self._con.commit()
+        _instances.add(self)
 
     @property
     def _con(self) -> sqlite3.Connection:
-        if not os.path.exists(self.path):
-            os.mkdir(self.path)
-        try:
-            return self.local.con
-        except AttributeError:
-            self.local.con = sqlite3.connect(
+        pool = getattr(_connections, "pool", None)
+        if pool is None:
+            pool = _connections.pool = {}
+        con = pool.get(self.connection_string)
+        if con is None:
+            con = sqlite3.connect(
                 self.connection_string,
                 timeout=self.timeout,
                 isolation_level=self.isolation_level,
             )
-            self._apply_pragma()
-            return self.local.con
+            self._apply_pragma(con)
+            pool[self.connection_string] = con
+        return con
 
     def __getitem__(self, item: str) -> Any:
         value = self.get(item)
@@ -138,7 +339,10 @@ class Cache:
         self.delete(key)
 
     def __contains__(self, key):
-        return self._con.execute(self._check_sql, {"key": key}).fetchone() is not None
+        if self._memory is not None and self._memory.get(key) is not _MISSING:
+            return True
+        self.flush()
+        return self._con.execute(self._check_sql, {"key": key, "now": time()}).fetchone() is not None
 
     def __enter__(self):
         self._con  # noqa pylint: disable=W0104
@@ -148,25 +352,28 @@ class Cache:
         self.close()
 
     def __del__(self):
-        self.local.instances = getattr(self.local, "instances", 0) - 1
-        if self.local.instances <= 0:
+        with suppress(Exception):
             self.close()
 
     def close(self) -> None:
-        """Closes the cache."""
-        self._con.execute(
-            self._set_pragma.format("optimize")
-        )  # https://www.sqlite.org/pragma.html#pragma_optimize
-        self._con.close()
-        with suppress(AttributeError):
-            delattr(self.local, "con")
-
-    def _apply_pragma(self):
+        """Closes the cache. The connection of a shared database stays open for the other namespaces."""
+        self.flush()
+        if self.shared:
+            return
+        with suppress(AttributeError, KeyError):
+            con = _connections.pool.pop(self.connection_string)
+            con.execute(
+                self._set_pragma.format("optimize")
+            )  # https://www.sqlite.org/pragma.html#pragma_optimize
+            con.close()
+
+    def _apply_pragma(self, con: sqlite3.Connection):
         for key, value in self.pragma.items():
-            self._con.execute(self._set_pragma_equal.format(key, value))
+            con.execute(self._set_pragma_equal.format(key, value))
 
-    @staticmethod
-    def _exp_timestamp(timeout: int = DEFAULT_TIMEOUT) -> float:
+    def _exp_timestamp(self, timeout: Optional[int] = None) -> float:
+        if timeout is None:
+            timeout = self.default_timeout
         if timeout < 0:
             return -1.0
         return (datetime.now(tz=timezone.utc) + timedelta(seconds=timeout)).timestamp()
@@ -181,7 +388,35 @@ class Cache:
     def _unstream(self, value: bytes) -> Any:
         return pickle.loads(value)  # noqa: S301
 
-    def add(self, key: str, value: Any, timeout: int = DEFAULT_TIMEOUT) -> None:
+    def _forget(self, key: str) -> None:
+        if self._memory is not None:
+            self._memory.pop(key)
+
+    def flush(self) -> None:
+        """Write queued write-behind values to SQLite in one transaction."""
+        if not self._pending:
+            return
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        now = time()
+        seq = [
+            {"key": key, "value": self._stream(value), "exp": exp, "now": now}
+            for key, value, exp in pending.values()
+        ]
+        self._con.executemany(self._set_sql, seq)
+        self._con.commit()
+
+    def memory_stats(self) -> Dict[str, int]:
+        if self._memory is None:
+            return {}
+        return {
+            "size": len(self._memory._data),
+            "hits": self._memory.hits,
+            "misses": self._memory.misses,
+            "pending": len(self._pending),
+        }
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
         """Set the value to the cache only if the key is not already in the cache,
         or the found value has expired.
 
@@ -190,10 +425,13 @@ class Cache:
         :param timeout: How long the value is valid in the cache.
                         Negative numbers will keep the key in cache until manually removed.
         """
+        self.flush()
+        self._forget(key)
         data = {
             "key": key,
             "value": self._stream(value),
             "exp": self._exp_timestamp(timeout),
+            "now": time(),
         }
         self._con.execute(self._add_sql, data)
         self._con.commit()
@@ -204,6 +442,14 @@ class Cache:
         :param key: Cache key.
         :param default: Value to return if key not in the cache.
         """
+        if self._memory is not None:
+            value = self._memory.get(key)
+            if value is not _MISSING:
+                return value
+        if pending := self._pending.get(str(key)):
+            _, value, exp = pending
+            return value if exp == -1.0 or exp > time() else default
+
         result: Optional[Tuple[bytes, float]] = self._con.execute(
             self._get_sql, {"key": key}
         ).fetchone()
@@ -217,9 +463,13 @@ class Cache:
             self._con.commit()
             return default
 
-        return self._unstream(result[0])
+        value = self._unstream(result[0])
+        self._touched.add(str(key))
+        if self._memory is not None:
+            self._memory.put(key, value, result[1])
+        return value
 
-    def set(self, key: str, value: Any, timeout: int = DEFAULT_TIMEOUT) -> None:
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
         """Set a value in cache under some key.
 
         :param key: Cache key.
@@ -227,11 +477,16 @@ class Cache:
         :param timeout: How long the value is valid in the cache.
                         Negative numbers will keep the key in cache until manually removed.
         """
-        data = {
-            "key": key,
-            "value": self._stream(value),
-            "exp": self._exp_timestamp(timeout),
-        }
+        exp = self._exp_timestamp(timeout)
+        if self._memory is not None:
+            self._memory.put(key, value, exp)
+        if self.write_behind:
+            with self._pending_lock:
+                self._pending[str(key)] = (key, value, exp)
+            if len(self._pending) >= self.write_behind_batch:
+                self.flush()
+            return
+        data = {"key": key, "value": self._stream(value), "exp": exp, "now": time()}
         self._con.execute(self._set_sql, data)
         self._con.commit()
 
@@ -241,18 +496,22 @@ class Cache:
         :param key: Cache key.
         :param value: Picklable object to store.
         """
-        data = {"key": key, "value": self._stream(value)}
+        self.flush()
+        self._forget(key)
+        data = {"key": key, "value": self._stream(value), "now": time()}
         self._con.execute(self._update_sql, data)
         self._con.commit()
 
-    def touch(self, key: str, timeout: int = DEFAULT_TIMEOUT) -> None:
+    def touch(self, key: str, timeout: Optional[int] = None) -> None:
         """Extend the lifetime of an object in cache. Does nothing if key is not in the cache or is expired.
 
         :param key: Cache key.
         :param timeout: How long the value is valid in the cache.
                         Negative numbers will keep the key in cache until manually removed.
         """
-        data = {"exp": self._exp_timestamp(timeout), "key": key}
+        self.flush()
+        self._forget(key)
+        data = {"exp": self._exp_timestamp(timeout), "key": key, "now": time()}
         self._con.execute(self._touch_sql, data)
         self._con.commit()
 
@@ -261,10 +520,13 @@ class Cache:
 
         :param key: Cache key.
         """
+        self._forget(key)
+        with self._pending_lock:
+            self._pending.pop(str(key), None)
         self._con.execute(self._delete_sql, {"key": key})
         self._con.commit()
 
-    def add_many(self, dict_: Dict[str, Any], timeout: int = DEFAULT_TIMEOUT) -> None:
+    def add_many(self, dict_: Dict[str, Any], timeout: Optional[int] = None) -> None:
         """For all keys in the given dict, add the value to the cache only if the key is not
         already in the cache, or the found value has expired.
 
@@ -272,11 +534,16 @@ class Cache:
         :param timeout: How long the value is valid in the cache.
                         Negative numbers will keep the key in cache until manually removed.
         """
+        self.flush()
+        for key in dict_:
+            self._forget(key)
         command = self._add_many_sql.format(
-            ", ".join([f"(:key{n}, :value{n}, :exp{n})" for n in range(len(dict_))])
+            ", ".join(
+                [f"(:key{n}, :value{n}, :exp{n}, :now)" for n in range(len(dict_))]
+            )
         )
 
-        data = {}
+        data = {"now": time()}
         exp = self._exp_timestamp(timeout)
         for i, (key, value) in enumerate(dict_.items()):
             data[f"key{i}"] = key
@@ -291,23 +558,39 @@ class Cache:
 
         :param keys: List of cache keys.
         """
+        results: Dict[str, Any] = {}
+        if self._memory is not None:
+            missing = []
+            for key in keys:
+                value = self._memory.get(key)
+                if value is _MISSING:
+                    missing.append(key)
+                else:
+                    results[str(key)] = value
+            if not missing:
+                return results
+            keys = missing
+        self.flush()
+
         seq = ", ".join([f"'{value}'" for value in keys])
         fetched: List[Tuple[str, Any, float]] = self._con.execute(
             self._get_many_sql.format(seq)
         ).fetchall()
 
         if not fetched:
-            return {}
+            return results
 
-        results: Dict[str, Any] = {}
         to_delete: List[str] = []
         for key, value, exp in fetched:
-            exp = self._exp_datetime(exp)
-            if exp is not None and datetime.utcnow() >= exp:
+            exp_ = self._exp_datetime(exp)
+            if exp_ is not None and datetime.utcnow() >= exp_:
                 to_delete.append(key)
                 continue
 
             results[key] = self._unstream(value)
+            self._touched.add(key)
+            if self._memory is not None:
+                self._memory.put(key, results[key], exp)
 
         if to_delete:
             self._con.execute(
@@ -319,23 +602,28 @@ class Cache:
 
         return results
 
-    def set_many(self, dict_: Dict[str, Any], timeout: int = DEFAULT_TIMEOUT) -> None:
+    def set_many(self, dict_: Dict[str, Any], timeout: Optional[int] = None) -> None:
         """Set values to the cache for all keys in the given dict.
 
         :param dict_: Cache keys with values to set.
         :param timeout: How long the value is valid in the cache.
                         Negative numbers will keep the key in cache until manually removed.
         """
+        self.flush()
         command = self._set_many_sql.format(
-            ", ".join([f"(:key{n}, :value{n}, :exp{n})" for n in range(len(dict_))])
+            ", ".join(
+                [f"(:key{n}, :value{n}, :exp{n}, :now)" for n in range(len(dict_))]
+            )
         )
 
-        data = {}
+        data = {"now": time()}
         exp = self._exp_timestamp(timeout)
         for i, (key, value) in enumerate(dict_.items()):
             data[f"key{i}"] = key
             data[f"value{i}"] = self._stream(value)
             data[f"exp{i}"] = exp
+            if self._memory is not None:
+                self._memory.put(key, value, exp)
 
         self._con.execute(command, data)
         self._con.commit()
@@ -345,13 +633,18 @@ class Cache:
 
         :param dict_:Cache keys with values to update to.
         """
+        self.flush()
+        for key in dict_:
+            self._forget(key)
+        now = time()
         seq = [
-            {"key": key, "value": self._stream(value)} for key, value in dict_.items()
+            {"key": key, "value": self._stream(value), "now": now}
+            for key, value in dict_.items()
         ]
         self._con.executemany(self._update_sql, seq)
         self._con.commit()
 
-    def touch_many(self, keys: List[str], timeout: int = DEFAULT_TIMEOUT) -> None:
+    def touch_many(self, keys: List[str], timeout: Optional[int] = None) -> None:
         """Extend the lifetime for all objects under the given keys in cache.
         Does nothing if a key is not in the cache or is expired.
 
@@ -359,8 +652,12 @@ class Cache:
         :param timeout: How long the value is valid in the cache.
                         Negative numbers will keep the key in cache until manually removed.
         """
+        self.flush()
+        for key in keys:
+            self._forget(key)
         exp = self._exp_timestamp(timeout)
-        seq = [{"key": key, "exp": exp} for key in keys]
+        now = time()
+        seq = [{"key": key, "exp": exp, "now": now} for key in keys]
         self._con.executemany(self._touch_sql, seq)
         self._con.commit()
 
@@ -369,12 +666,15 @@ class Cache:
 
         :param keys: List of cache keys.
         """
+        self.flush()
+        for key in keys:
+            self._forget(key)
         self._con.execute(
             self._delete_many_sql.format(", ".join([f"'{value}'" for value in keys]))
         )
         self._con.commit()
 
-    def get_or_set(self, key: str, default: Any, timeout: int = DEFAULT_TIMEOUT) -> Any:
+    def get_or_set(self, key: str, default: Any, timeout: Optional[int] = None) -> Any:
         """Get a value under some key, or set the default if key is not in cache.
 
         :param key: Cache key.
@@ -382,33 +682,24 @@ class Cache:
         :param timeout: How long the value is valid in the cache.
                         Negative numbers will keep the key in cache until manually removed.
         """
-        result: Optional[Tuple[bytes, float]] = self._con.execute(
-            self._get_sql, {"key": key}
-        ).fetchone()
-
-        if result is not None:
-            exp = self._exp_datetime(result[1])
-            if exp is not None and datetime.utcnow() >= exp:
-                self._con.execute(self._delete_sql, {"key": key})
-            else:
-                return self._unstream(result[0])
-
-        data = {
-            "key": key,
-            "value": self._stream(default),
-            "exp": self._exp_timestamp(timeout),
-        }
-        self._con.execute(self._set_sql, data)
-        self._con.commit()
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        self.set(key, default, timeout)
         return default
 
     def get_all(self) -> Dict[str, Any]:
         """Get all key-value pairs from the cache."""
-        all_data = self._con.execute("SELECT key, value FROM cache;").fetchall()
+        self.flush()
+        all_data = self._con.execute(self._get_all_sql).fetchall()
         return {key: self._unstream(value) for key, value in all_data}
 
     def clear(self) -> None:
         """Clear the cache from all values."""
+        if self._memory is not None:
+            self._memory.clear()
+        with self._pending_lock:
+            self._pending.clear()
         self._con.execute(self._clear_sql)
         self._con.commit()
 
@@ -420,8 +711,10 @@ class Cache:
         :param delta: How much to increment.
         :raises ValueError: Value cannot be incremented.
         """
+        self.flush()
+        self._forget(key)
         result: Optional[Tuple[bytes, float]] = self._con.execute(
-            self._check_sql, {"key": key}
+            self._check_sql, {"key": key, "now": time()}
         ).fetchone()
 
         if result is None:
@@ -433,7 +726,8 @@ class Cache:
 
         new_value = value + delta
         self._con.execute(
-            self._update_sql, {"key": key, "value": self._stream(new_value)}
+            self._update_sql,
+            {"key": key, "value": self._stream(new_value), "now": time()},
         )
         self._con.commit()
         return new_value
@@ -446,8 +740,10 @@ class Cache:
         :param delta: How much to decrement.
         :raises ValueError: Value cannot be decremented.
         """
+        self.flush()
+        self._forget(key)
         result: Optional[Tuple[bytes, float]] = self._con.execute(
-            self._check_sql, {"key": key}
+            self._check_sql, {"key": key, "now": time()}
         ).fetchone()
 
         if result is None:
@@ -459,13 +755,105 @@ class Cache:
 
         new_value = value - delta
         self._con.execute(
-            self._update_sql, {"key": key, "value": self._stream(new_value)}
+            self._update_sql,
+            {"key": key, "value": self._stream(new_value), "now": time()},
         )
         self._con.commit()
         return new_value
 
+    def _delete_keys(self, keys: List[str]) -> None:
+        for key in keys:
+            self._forget(key)
+        self._con.execute(
+            self._delete_many_sql.format(", ".join("?" * len(keys))), keys
+        )
+        self._con.commit()
+
+    def _excess_rows(self) -> int:
+        rows, size = self._con.execute(self._size_sql).fetchone()
+        self.sweeps["rows"], self.sweeps["bytes"] = rows, size
+        excess = rows - self.max_rows if self.max_rows else 0
+        if self.max_bytes and size > self.max_bytes:
+            # Rows are assumed to be of average size, the next sweep corrects the estimate
+            excess = max(excess, ceil(rows * (size - self.max_bytes) / size))
+        return excess
+
+    def sweep(self, batch: int = 500, vacuum_pages: int = 1000) -> Dict[str, int]:
+        """Delete expired rows, evict least recently used rows above the caps
+        and return free pages to the filesystem.
+
+        Work is done in chunks of ``batch`` rows with a commit in between, so
+        other connections are only locked out for short moments.
+
+        :param batch: Rows deleted per transaction.
+        :param vacuum_pages: Free pages released per incremental vacuum.
+        """
+        self.flush()
+        expired = evicted = 0
+        while keys := [
+            row[0]
+            for row in self._con.execute(
+                self._expired_sql, {"now": time(), "batch": batch}
+            )
+        ]:
+            self._delete_keys(keys)
+            expired += len(keys)
+
+        if self.max_rows or self.max_bytes:
+            touched, self._touched = self._touched, set()
+            if self._memory is not None:
+                touched.update(self._memory.keys())
+            if touched:
+                now = time()
+                self._con.executemany(
+                    self._atime_sql, [{"key": key, "now": now} for key in touched]
+                )
+                self._con.commit()
+            while (excess := self._excess_rows()) > 0:
+                keys = [
+                    row[0]
+                    for row in self._con.execute(
+                        self._lru_sql, {"batch": min(excess, batch)}
+                    )
+                ]
+                if not keys:
+                    break
+                self._delete_keys(keys)
+                evicted += len(keys)
+        else:
+            self._touched.clear()
+            # Only refreshes the size figures reported by stats()
+            self._excess_rows()
+        self.sweeps["expired"] += expired
+        self.sweeps["evicted"] += evicted
+
+        free = self._con.execute(self._set_pragma.format("freelist_count")).fetchone()[0]
+        if free:
+            if self._con.execute(self._set_pragma.format("auto_vacuum")).fetchone()[0] != 2:
+                # Files created with auto_vacuum=none need one full VACUUM to switch
+                self._con.execute(self._set_pragma_equal.format("auto_vacuum", "incremental"))
+                self._con.execute("VACUUM;")
+            else:
+                # executescript steps the pragma to completion, execute frees a single page
+                self._con.executescript(
+                    self._set_pragma.format(f"incremental_vacuum({vacuum_pages})")
+                )
+        return {"expired": expired, "evicted": evicted, "free_pages": free}
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of this namespace, sizes are as of the last sweep."""
+        return {
+            "database": self.connection_string,
+            "default_timeout": self.default_timeout,
+            "max_rows": self.max_rows,
+            "max_bytes": self.max_bytes,
+            **self.sweeps,
+            "memory": self.memory_stats(),
+            "memoized": self.memoized,
+        }
+
     def memoize(
-        self, timeout: int = DEFAULT_TIMEOUT
+        self, timeout: Optional[int] = None
     ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         """Save the result of the decorated function in cache. Calls with different
         arguments are saved under different keys.
@@ -497,6 +885,7 @@ class Cache:
 
         :param key: Cache key.
         """
+        self.flush()
         result: Optional[Tuple[bytes, float]] = self._con.execute(
             self._get_sql, {"key": key}
         ).fetchone()
@@ -523,6 +912,7 @@ class Cache:
 
         :param keys: List of cache keys.
         """
+        self.flush()
         seq = ", ".join([f"'{value}'" for value in keys])
         fetched: List[Tuple[str, Any, float]] = self._con.execute(
             self._get_many_sql.format(seq)
@@ -558,3 +948,410 @@ class Cache:
             self._con.commit()
 
         return results
+
+
+class AsyncCache:
+    """Awaitable front of :class:`Cache` that keeps SQLite off the event loop.
+
+    Writes run on one dedicated thread per database, so they never wait on
+    each other for the WAL lock, and reads go to a small pool of threads with their own
+    connections. ``set`` calls made before the queued write starts are merged
+    into one transaction. Values still in the memory tier are returned on the
+    loop without a thread hop.
+    """
+
+    # connection string -> (writer, readers), namespaces of one database share them
+    _executors: Dict[str, Tuple[ThreadPoolExecutor, ThreadPoolExecutor]] = {}
+
+    def __init__(self, *, readers: int = 2, **kwargs):
+        """Create the cache, ``kwargs`` are passed to :class:`Cache`.
+
+        :param readers: Threads serving reads that miss the memory tier,
+                        set by the first AsyncCache of a database.
+        """
+        self.cache = Cache(**kwargs)
+        executors = self._executors.get(self.cache.connection_string)
+        if executors is None:
+            executors = self._executors[self.cache.connection_string] = (
+                ThreadPoolExecutor(1, thread_name_prefix="cache-writer"),
+                ThreadPoolExecutor(readers, thread_name_prefix="cache-reader"),
+            )
+        self._writer, self._readers = executors
+        self.cache._executor = self._writer
+        # str(key) -> (key, value, exp) queued or being written
+        self._unwritten: Dict[str, Tuple[Any, Any, float]] = {}
+        self._batch: Optional[Dict[str, Tuple[Any, Any, float]]] = None
+        self._batch_done: Optional[asyncio.Future] = None
+        # Bumped by every write, a read started before it must not fill memory
+        self._version = 0
+        self.batches = 0
+        self.batched_sets = 0
+
+    def __getitem__(self, key: str):
+        """``await cache[key]``, raises KeyError like ``Cache[key]``."""
+        return self._getitem(key)
+
+    async def _getitem(self, key: str) -> Any:
+        value = await self.get(key)
+        if value is None:
+            raise KeyError("Key not in cache.")
+        return value
+
+    def _lookup(self, key: str) -> Any:
+        if entry := self._unwritten.get(str(key)):
+            _, value, exp = entry
+            return value if exp == -1.0 or exp > time() else None
+        if self.cache._memory is not None:
+            return self.cache._memory.get(key)
+        return _MISSING
+
+    def _remember(self, version: int, key: str, value: Any, exp: float):
+        if self.cache._memory is not None and version == self._version:
+            self.cache._memory.put(key, value, exp)
+
+    def _read(self, key: str) -> Optional[Tuple[Any, float]]:
+        row = self.cache._con.execute(self.cache._get_sql, {"key": key}).fetchone()
+        if row is None or (row[1] != -1.0 and row[1] <= time()):
+            return None
+        self.cache._touched.add(str(key))
+        return self.cache._unstream(row[0]), row[1]
+
+    def _read_many(self, keys: List[str]) -> Dict[str, Tuple[Any, float]]:
+        command = self.cache._get_many_sql.format(", ".join("?" * len(keys)))
+        now = time()
+        rows = {
+            key: (self.cache._unstream(value), exp)
+            for key, value, exp in self.cache._con.execute(command, keys)
+            if exp == -1.0 or exp > now
+        }
+        self.cache._touched.update(rows)
+        return rows
+
+    def _write_batch(self, entries: List[Tuple[Any, Any, float]]) -> Dict[str, Exception]:
+        # Each entry is stored on its own, an unpicklable value only fails its own set
+        failed: Dict[str, Exception] = {}
+        now = time()
+        for key, value, exp in entries:
+            try:
+                self.cache._con.execute(
+                    self.cache._set_sql,
+                    {"key": key, "value": self.cache._stream(value), "exp": exp, "now": now},
+                )
+            except Exception as err:
+                failed[str(key)] = err
+        self.cache._con.commit()
+        return failed
+
+    def _submit(self):
+        batch, done = self._batch, self._batch_done
+        if batch is None:
+            return
+        self._batch = self._batch_done = None
+        self.batches += 1
+        self.batched_sets += len(batch)
+        future = asyncio.get_running_loop().run_in_executor(
+            self._writer, self._write_batch, list(batch.values())
+        )
+        future.add_done_callback(partial(self._written, batch, done))
+
+    def _written(self, batch: dict, done: asyncio.Future, future: asyncio.Future):
+        failed = batch if future.exception() is not None else future.result()
+        for skey, entry in batch.items():
+            if self._unwritten.get(skey) is entry:
+                del self._unwritten[skey]
+                if skey in failed:
+                    # Not in SQLite, so the memory tier must not serve it either
+                    self.cache._forget(entry[0])
+        if done.cancelled():
+            return
+        if future.exception() is not None:
+            done.set_exception(future.exception())
+        else:
+            done.set_result(failed)
+
+    async def _write(self, func: Callable, *args) -> Any:
+        # Queued sets go first, the writer runs jobs in submission order
+        self._submit()
+        self._version += 1
+        return await asyncio.get_running_loop().run_in_executor(
+            self._writer, partial(func, *args)
+        )
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get the value under some key. Return `default` if key is not in the cache or expired.
+
+        :param key: Cache key.
+        :param default: Value to return if key not in the cache.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return default if value is None else value
+        version = self._version
+        row = await asyncio.get_running_loop().run_in_executor(
+            self._readers, self._read, key
+        )
+        if row is None:
+            return default
+        self._remember(version, key, *row)
+        return row[0]
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get all values from the cache for the given keys, skipping missing or expired ones.
+
+        :param keys: List of cache keys.
+        """
+        results: Dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            value = self._lookup(key)
+            if value is _MISSING:
+                missing.append(str(key))
+            elif value is not None:
+                results[str(key)] = value
+        if not missing:
+            return results
+        version = self._version
+        rows = await asyncio.get_running_loop().run_in_executor(
+            self._readers, self._read_many, missing
+        )
+        for key, (value, exp) in rows.items():
+            self._remember(version, key, value, exp)
+            results[key] = value
+        return results
+
+    async def set(self, key: str, value: Any, timeout: Optional[int] = None):
+        """Set a value in cache under some key, batched with concurrent sets.
+
+        :param key: Cache key.
+        :param value: Picklable object to store.
+        :param timeout: How long the value is valid in the cache.
+                        Negative numbers will keep the key in cache until manually removed.
+        """
+        exp = self.cache._exp_timestamp(timeout)
+        entry = (key, value, exp)
+        self._version += 1
+        self._unwritten[str(key)] = entry
+        if self.cache._memory is not None:
+            self.cache._memory.put(key, value, exp)
+        if self._batch is None:
+            loop = asyncio.get_running_loop()
+            self._batch = {}
+            self._batch_done = loop.create_future()
+            loop.call_soon(self._submit)
+        self._batch[str(key)] = entry
+        failed = await asyncio.shield(self._batch_done)
+        if str(key) in failed:
+            raise failed[str(key)]
+
+    async def add(self, key: str, value: Any, timeout: Optional[int] = None):
+        """Set the value only if the key is not already in the cache, or the found value has expired.
+
+        :param key: Cache key.
+        :param value: Picklable object to store.
+        :param timeout: How long the value is valid in the cache.
+                        Negative numbers will keep the key in cache until manually removed.
+        """
+        await self._write(self.cache.add, key, value, timeout)
+
+    async def delete(self, key: str):
+        """Delete value from the cache.
+
+        :param key: Cache key.
+        """
+        self._unwritten.pop(str(key), None)
+        self.cache._forget(key)
+        await self._write(self.cache.delete, key)
+
+    async def clear(self):
+        """Clear the cache from all values."""
+        self._unwritten.clear()
+        if self.cache._memory is not None:
+            self.cache._memory.clear()
+        await self._write(self.cache.clear)
+
+    async def sweep(self, **kwargs) -> Dict[str, int]:
+        """Run :meth:`Cache.sweep` on the writer thread."""
+        return await self._write(partial(self.cache.sweep, **kwargs))
+
+    def memoize(
+        self,
+        timeout: Optional[int] = None,
+        error_timeout: int = 60,
+        errors: Tuple[type, ...] = (Exception,),
+        is_failure: Optional[Callable[[Any], bool]] = None,
+        key: Optional[Callable[..., str]] = None,
+    ) -> Callable[..., Any]:
+        """Cache the result of the decorated coroutine function.
+
+        Concurrent calls with the same key share one running call. Raised
+        ``errors``, and results for which ``is_failure`` returns True, are
+        remembered for ``error_timeout`` seconds only, so a broken or rate
+        limited upstream is not hammered by every retry. Failures are kept
+        in memory, exceptions are not always picklable.
+
+        :param timeout: How long a result is valid in the cache. Defaults to the namespace TTL.
+        :param error_timeout: How long a failure is remembered.
+        :param errors: Exceptions that count as failures, others are not cached.
+        :param is_failure: Tells failed results apart from good ones, e.g. an empty response.
+        :param key: Builds the cache key from the call arguments, defaults to their repr.
+        """
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            name = f"{func.__module__}.{func.__qualname__}"
+            counters = self.cache.memoized[name] = {
+                "hits": 0,
+                "misses": 0,
+                "shared": 0,
+                "failures": 0,
+                "failure_hits": 0,
+            }
+            failures = _MemoryTier(maxsize=1024, ttl=error_timeout)
+            inflight: Dict[str, asyncio.Future] = {}
+
+            async def call(cache_key: str, args: tuple, kwargs: dict) -> Any:
+                try:
+                    result = await func(*args, **kwargs)
+                except errors as exc:
+                    counters["failures"] += 1
+                    failures.put(cache_key, _Failure.of(exc), -1.0)
+                    raise
+                if is_failure is not None and is_failure(result):
+                    counters["failures"] += 1
+                    failures.put(cache_key, result, -1.0)
+                else:
+                    try:
+                        await self.set(cache_key, result, timeout)
+                    except Exception as err:
+                        # The call itself succeeded, a value that can't be cached is just not cached
+                        LOGGER.warning(f"Could not cache the result of {name}: {err}")
+                return result
+
+            @wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if key is not None:
+                    cache_key = f"{name}:{key(*args, **kwargs)}"
+                else:
+                    cache_key = f"{name}:{args!r}:{sorted(kwargs.items())!r}"
+                failure = failures.get(cache_key)
+                if failure is not _MISSING:
+                    counters["failure_hits"] += 1
+                    if isinstance(failure, _Failure):
+                        # A fresh instance per hit, a shared one would pile up tracebacks and context
+                        raise failure.exception()
+                    return failure
+                result = await self.get(cache_key, _MISSING)
+                if result is not _MISSING:
+                    counters["hits"] += 1
+                    return result
+                task = inflight.get(cache_key)
+                if task is None:
+                    counters["misses"] += 1
+                    task = inflight[cache_key] = asyncio.ensure_future(
+                        call(cache_key, args, kwargs)
+                    )
+                    task.add_done_callback(lambda _: inflight.pop(cache_key, None))
+                else:
+                    counters["shared"] += 1
+                # shield so one cancelled caller doesn't abort the call for the others
+                return await asyncio.shield(task)
+
+            wrapper.counters = counters
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self.cache.memory_stats(),
+            "unwritten": len(self._unwritten),
+            "batches": self.batches,
+            "batched_sets": self.batched_sets,
+        }
+
+
+
+class PagedCache:
+    """Paginated results stored as one small entry per page.
+
+    ``{id}:meta`` holds ``(page count, query)`` and ``{id}:{n}`` holds page
+    ``n`` as compact JSON, so turning a page or resolving one link reads and
+    decodes a single page instead of the whole result set.
+    """
+
+    def __init__(self, cache: AsyncCache):
+        self.cache = cache
+
+    @staticmethod
+    def _encode(page: list) -> bytes:
+        # Scraped fields can be bs4 objects, they are rendered with str() anyway
+        return json.dumps(page, separators=(",", ":"), default=str).encode()
+
+    def __getitem__(self, result_id: int):
+        """``await paged[result_id]`` gives ``(page count, query)``, raises KeyError."""
+        return self.cache[f"{result_id}:meta"]
+
+    async def get(self, result_id: int) -> Optional[Tuple[int, Any]]:
+        return await self.cache.get(f"{result_id}:meta")
+
+    async def has(self, result_id: int, index: int) -> bool:
+        """Whether the meta entry and page ``index`` are both cached.
+
+        Pages are evicted one by one under ``max_bytes``, the meta entry can
+        outlive them. Callers refetch when this is False, ``add`` then
+        rewrites the whole result set.
+        """
+        keys = [f"{result_id}:meta", f"{result_id}:{index}"]
+        return len(await self.cache.get_many(keys)) == len(keys)
+
+    async def add(
+        self,
+        result_id: int,
+        pages: List[list],
+        query: Any,
+        timeout: Optional[int] = None,
+    ):
+        """Store ``pages`` and their query, all in one write batch.
+
+        :param result_id: Id shared by the pages, usually the message id.
+        :param pages: Results already split into pages.
+        :param query: Search query, returned next to the page count.
+        :param timeout: How long the results are valid in the cache.
+        """
+        await asyncio.gather(
+            *(
+                self.cache.set(f"{result_id}:{n}", self._encode(page), timeout)
+                for n, page in enumerate(pages)
+            ),
+            self.cache.set(f"{result_id}:meta", (len(pages), query), timeout),
+        )
+
+    async def page(self, result_id: int, index: int) -> list:
+        """Page ``index`` (0 based) of the results, raises KeyError once expired."""
+        return json.loads(await self.cache[f"{result_id}:{index}"])
+
+    async def clear(self):
+        await self.cache.clear()
+
+
+# Results of upstream lookups, see AsyncCache.memoize
+memo_cache = AsyncCache(filename="memo_cache.db", path="cache", in_memory=False)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """:meth:`Cache.stats` of every open cache by namespace."""
+    return {cache.namespace: cache.stats() for cache in list(_instances)}
+
+
+async def cache_sweeper(interval: int = 10 * 60):
+    """Sweep every open cache every ``interval`` seconds, off the event loop."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        for cache in list(_instances):
+            try:
+                result = await loop.run_in_executor(cache._executor, cache.sweep)
+            except sqlite3.Error as err:
+                LOGGER.warning(f"Cache sweep of {cache.connection_string} failed: {err}")
+                continue
+            if result["expired"] or result["evicted"]:
+                LOGGER.info(f"Cache sweep of {cache.connection_string}: {result}")
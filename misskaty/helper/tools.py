@@ -18,6 +18,7 @@ from misskaty import BOT_NAME, UBOT_NAME, botStartTime
 from misskaty.core.decorator import asyncify
 from misskaty.helper.http import fetch
 from misskaty.helper.human_read import get_readable_time
+from misskaty.helper.sqlite_helper import memo_cache
 from misskaty.plugins import ALL_MODULES
 
 LOGGER = logging.getLogger("MissKaty")
@@ -136,6 +137,8 @@ def get_provider(url):
     return pretty(netloc.split("."))
 
 
+# An empty string is also what a failed or rate limited lookup returns
+@memo_cache.memoize(timeout=6 * 60 * 60, error_timeout=5 * 60, is_failure=lambda res: not res)
 async def search_jw(movie_name: str, locale: Union[str, None] = "ID"):
     m_t_ = ""
     try:
@@ -26,7 +26,6 @@ import asyncio
 import os
 import re
 from logging import getLogger
-from time import time
 
 from pyrogram import Client, enums, filters
 from pyrogram.errors import (
@@ -44,8 +43,10 @@ from misskaty.core.decorator.permissions import (
     admins_in_chat,
     list_admins,
     member_permissions,
+    member_privileges,
 )
 from misskaty.core.keyboard import ikb
+from misskaty.core.misskaty_patch.utils import self_member_cache
 from misskaty.helper.functions import (
     extract_user,
     extract_user_and_reason,
@@ -93,20 +94,28 @@ __HELP__ = """
 # Admin cache reload
 @app.on_chat_member_updated(filters.group, group=5)
 async def admin_cache_func(_, cmu):
-    if cmu.old_chat_member and cmu.old_chat_member.promoted_by:
-        try:
-            admins_in_chat[cmu.chat.id] = {
-                "last_updated_at": time(),
-                "data": [
-                    member.user.id
-                    async for member in app.get_chat_members(
-                        cmu.chat.id, filter=enums.ChatMembersFilter.ADMINISTRATORS
-                    )
-                ],
-            }
-            LOGGER.info(f"Updated admin cache for {cmu.chat.id} [{cmu.chat.title}]")
-        except:
-            pass
+    old, new = cmu.old_chat_member, cmu.new_chat_member
+    member = new or old
+    if not member or not member.user:
+        return
+    if new:
+        member_privileges.update(cmu.chat.id, new)
+    else:
+        member_privileges.invalidate(cmu.chat.id, member.user.id)
+    if member.user.id == app.me.id:
+        if new and new.status not in (
+            enums.ChatMemberStatus.LEFT,
+            enums.ChatMemberStatus.BANNED,
+        ):
+            self_member_cache.update(cmu.chat.id, new)
+        else:
+            self_member_cache.forget(cmu.chat.id)
+    admin_status = (enums.ChatMemberStatus.ADMINISTRATOR, enums.ChatMemberStatus.OWNER)
+    was_admin = bool(old and old.status in admin_status)
+    is_admin = bool(new and new.status in admin_status)
+    if was_admin != is_admin:
+        await admins_in_chat.update_member(cmu.chat.id, member.user.id, is_admin)
+        LOGGER.info(f"Updated admin cache for {cmu.chat.id} [{cmu.chat.title}]")
 
 
 # Purge CMD
@@ -16,7 +16,16 @@ import time
 from pyrogram import Client, enums, filters
 from pyrogram.types import Message
 
-from database.afk_db import add_afk, cleanmode_off, cleanmode_on, is_afk, remove_afk
+from database.afk_db import (
+    add_afk,
+    cleanmode_off,
+    cleanmode_on,
+    get_afk_reasons,
+    has_afk_users,
+    is_afk,
+    maybe_afk,
+    remove_afk,
+)
 from misskaty import app
 from misskaty.core.decorator.permissions import adminsOnly
 from misskaty.helper import get_readable_time2
@@ -227,6 +236,19 @@ async def afk_state(_, ctx: Message, strings):
         await ctx.reply_msg(strings("afkdel_help").format(cmd=ctx.command[0]), del_in=6)
 
 
+# @username mentions per message resolved through Telegram when the peer cache misses
+MAX_MENTION_LOOKUPS = 3
+
+
+async def cached_user_id(username: str):
+    """User id of ``username`` from the session's peer cache, None if unknown there."""
+    try:
+        peer = await app.storage.get_peer_by_username(username)
+    except (KeyError, ValueError):
+        return None
+    return getattr(peer, "user_id", None)
+
+
 # Detect user that AFK based on Yukki Repo
 @app.on_message(
     filters.group & ~filters.bot & ~filters.via_bot,
@@ -377,148 +399,89 @@ async def afk_watcher_func(self: Client, ctx: Message, strings):
             pass
 
     # If username or mentioned user is AFK
-    if ctx.entities:
-        entity = ctx.entities
-        j = 0
-        for _ in range(len(entity)):
-            if (entity[j].type) == enums.MessageEntityType.MENTION:
-                found = re.findall("@([_0-9a-zA-Z]+)", ctx.text)
-                try:
-                    get_user = found[j]
-                    user = await app.get_users(get_user)
-                    if user.id == replied_user_id:
-                        j += 1
+    if ctx.entities and has_afk_users():
+        mentioned = {}
+        usernames = iter(re.findall("@([_0-9a-zA-Z]+)", ctx.text or ctx.caption or ""))
+        lookups = 0
+        for entity in ctx.entities:
+            try:
+                if entity.type == enums.MessageEntityType.MENTION:
+                    username = next(usernames)
+                    user_id = await cached_user_id(username)
+                    if user_id is not None and not maybe_afk(user_id):
                         continue
-                except:
-                    j += 1
+                    # Unknown usernames cost an RPC each, only the first few are looked up
+                    if user_id is None and lookups >= MAX_MENTION_LOOKUPS:
+                        continue
+                    lookups += user_id is None
+                    user = await app.get_users(user_id or username)
+                    user_id, first_name = user.id, user.first_name
+                elif entity.type == enums.MessageEntityType.TEXT_MENTION:
+                    user_id, first_name = entity.user.id, entity.user.first_name
+                else:
                     continue
-                verifier, reasondb = await is_afk(user.id)
-                if verifier:
-                    try:
-                        afktype = reasondb["type"]
-                        timeafk = reasondb["time"]
-                        data = reasondb["data"]
-                        reasonafk = reasondb["reason"]
-                        seenago = get_readable_time2((int(time.time() - timeafk)))
-                        if afktype == "text":
-                            msg += strings("is_afk_msg_no_r").format(
-                                usr=user.first_name[:25], id=user.id, tm=seenago
-                            )
-                        if afktype == "text_reason":
-                            msg += strings("is_afk_msg_with_r").format(
-                                usr=user.first_name[:25],
-                                id=user.id,
+            except:
+                continue
+            if user_id != replied_user_id:
+                mentioned.setdefault(user_id, first_name)
+        # Single $in query for every mentioned user in this message
+        for user_id, reasondb in (await get_afk_reasons(mentioned)).items():
+            first_name = mentioned[user_id]
+            try:
+                afktype = reasondb["type"]
+                timeafk = reasondb["time"]
+                data = reasondb["data"]
+                reasonafk = reasondb["reason"]
+                seenago = get_readable_time2((int(time.time() - timeafk)))
+                if afktype == "text":
+                    msg += strings("is_afk_msg_no_r").format(
+                        usr=first_name[:25], id=user_id, tm=seenago
+                    )
+                if afktype == "text_reason":
+                    msg += strings("is_afk_msg_with_r").format(
+                        usr=first_name[:25],
+                        id=user_id,
+                        tm=seenago,
+                        reas=reasonafk,
+                    )
+                if afktype == "animation":
+                    if str(reasonafk) == "None":
+                        send = await ctx.reply_animation(
+                            data,
+                            caption=strings("is_afk_msg_no_r").format(
+                                usr=first_name[:25], id=user_id, tm=seenago
+                            ),
+                        )
+                    else:
+                        send = await ctx.reply_animation(
+                            data,
+                            caption=strings("is_afk_msg_with_r").format(
+                                usr=first_name[:25],
+                                id=user_id,
                                 tm=seenago,
                                 reas=reasonafk,
-                            )
-                        if afktype == "animation":
-                            if str(reasonafk) == "None":
-                                send = await ctx.reply_animation(
-                                    data,
-                                    caption=strings("is_afk_msg_no_r").format(
-                                        usr=user.first_name[:25], id=user.id, tm=seenago
-                                    ),
-                                )
-                            else:
-                                send = await ctx.reply_animation(
-                                    data,
-                                    caption=strings("is_afk_msg_with_r").format(
-                                        usr=user.first_name[:25],
-                                        id=user.id,
-                                        tm=seenago,
-                                        reas=reasonafk,
-                                    ),
-                                )
-                        if afktype == "photo":
-                            if str(reasonafk) == "None":
-                                send = await ctx.reply_photo(
-                                    photo=f"downloads/{user.id}.jpg",
-                                    caption=strings("is_afk_msg_no_r").format(
-                                        usr=user.first_name[:25], id=user.id, tm=seenago
-                                    ),
-                                )
-                            else:
-                                send = await ctx.reply_photo(
-                                    photo=f"downloads/{user.id}.jpg",
-                                    caption=strings("is_afk_msg_with_r").format(
-                                        usr=user.first_name[:25],
-                                        id=user.id,
-                                        tm=seenago,
-                                        reas=reasonafk,
-                                    ),
-                                )
-                    except:
-                        msg += strings("is_afk").format(
-                            usr=user.first_name[:25], id=user.id
+                            ),
                         )
-            elif (entity[j].type) == enums.MessageEntityType.TEXT_MENTION:
-                try:
-                    user_id = entity[j].user.id
-                    if user_id == replied_user_id:
-                        j += 1
-                        continue
-                    first_name = entity[j].user.first_name
-                except:
-                    j += 1
-                    continue
-                verifier, reasondb = await is_afk(user_id)
-                if verifier:
-                    try:
-                        afktype = reasondb["type"]
-                        timeafk = reasondb["time"]
-                        data = reasondb["data"]
-                        reasonafk = reasondb["reason"]
-                        seenago = get_readable_time2((int(time.time() - timeafk)))
-                        if afktype == "text":
-                            msg += strings("is_afk_msg_no_r").format(
+                if afktype == "photo":
+                    if str(reasonafk) == "None":
+                        send = await ctx.reply_photo(
+                            photo=f"downloads/{user_id}.jpg",
+                            caption=strings("is_afk_msg_no_r").format(
                                 usr=first_name[:25], id=user_id, tm=seenago
-                            )
-                        if afktype == "text_reason":
-                            msg += strings("is_afk_msg_with_r").format(
+                            ),
+                        )
+                    else:
+                        send = await ctx.reply_photo(
+                            photo=f"downloads/{user_id}.jpg",
+                            caption=strings("is_afk_msg_with_r").format(
                                 usr=first_name[:25],
                                 id=user_id,
                                 tm=seenago,
                                 reas=reasonafk,
-                            )
-                        if afktype == "animation":
-                            if str(reasonafk) == "None":
-                                send = await ctx.reply_animation(
-                                    data,
-                                    caption=strings("is_afk_msg_no_r").format(
-                                        usr=first_name[:25], id=user_id, tm=seenago
-                                    ),
-                                )
-                            else:
-                                send = await ctx.reply_animation(
-                                    data,
-                                    caption=strings("is_afk_msg_with_r").format(
-                                        usr=first_name[:25],
-                                        id=user_id,
-                                        tm=seenago,
-                                        reas=reasonafk,
-                                    ),
-                                )
-                        if afktype == "photo":
-                            if str(reasonafk) == "None":
-                                send = await ctx.reply_photo(
-                                    photo=f"downloads/{user_id}.jpg",
-                                    caption=strings("is_afk_msg_no_r").format(
-                                        usr=first_name[:25], id=user_id, tm=seenago
-                                    ),
-                                )
-                            else:
-                                send = await ctx.reply_photo(
-                                    photo=f"downloads/{user_id}.jpg",
-                                    caption=strings("is_afk_msg_with_r").format(
-                                        usr=first_name[:25],
-                                        id=user_id,
-                                        tm=seenago,
-                                        reas=reasonafk,
-                                    ),
-                                )
-                    except:
-                        msg += strings("is_afk").format(usr=first_name[:25], id=user_id)
-            j += 1
+                            ),
+                        )
+            except:
+                msg += strings("is_afk").format(usr=first_name[:25], id=user_id)
     if msg != "":
         try:
             send = await ctx.reply_text(msg, disable_web_page_preview=True)
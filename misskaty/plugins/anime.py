@@ -7,6 +7,7 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from misskaty import app
 from misskaty.helper.human_read import get_readable_time
+from misskaty.helper.sqlite_helper import memo_cache
 from misskaty.vars import COMMAND_HANDLER
 
 anime_query = """
@@ -141,6 +142,7 @@ query ($id: Int, $idMal: Int, $search: String) {
 """
 
 
+@memo_cache.memoize(is_failure=lambda body: b'"errors"' in body)
 async def get_anime(title):
     async with aiohttp.ClientSession() as sesi:
         r = await sesi.post(
@@ -4,6 +4,7 @@ from pyrogram import Client, filters
 from pyrogram.errors import ChannelPrivate, PeerIdInvalid
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 
+from database.chat_state import get_chat_state
 from database.users_chats_db import db
 from misskaty import app
 from misskaty.helper.localization import use_chat_lang
@@ -27,7 +28,8 @@ async def ban_reply(_, ctx: Message):
 async def grp_bd(self: Client, ctx: Message, strings):
     if not ctx.from_user:
         return
-    if not await db.is_chat_exist(ctx.chat.id):
+    chck = (await get_chat_state(ctx)).chat_status
+    if not chck:
         try:
             total = await self.get_chat_members_count(ctx.chat.id)
         except ChannelPrivate:
@@ -40,16 +42,15 @@ async def grp_bd(self: Client, ctx: Message, strings):
             ),
         )
         await db.add_chat(ctx.chat.id, ctx.chat.title)
-    chck = await db.get_chat(ctx.chat.id)
+        chck = await db.get_chat(ctx.chat.id)
     if chck["is_disabled"]:
         buttons = [
             [InlineKeyboardButton("Support", url=f"https://t.me/{SUPPORT_CHAT}")]
         ]
         reply_markup = InlineKeyboardMarkup(buttons)
-        vazha = await db.get_chat(ctx.chat.id)
         try:
             k = await ctx.reply_msg(
-                f"CHAT NOT ALLOWED 🐞\n\nMy owner has restricted me from working here!\nReason : <code>{vazha['reason']}</code>.",
+                f"CHAT NOT ALLOWED 🐞\n\nMy owner has restricted me from working here!\nReason : <code>{chck['reason']}</code>.",
                 reply_markup=reply_markup,
             )
             await k.pin()
@@ -22,7 +22,6 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import re
 from datetime import datetime, timedelta
 
 from pyrogram import filters
@@ -30,10 +29,12 @@ from pyrogram.errors import ChatAdminRequired
 from pyrogram.types import ChatPermissions
 
 from database.blacklist_db import (
+    blacklist_engine,
     delete_blacklist_filter,
     get_blacklisted_words,
     save_blacklist_filter,
 )
+from database.chat_state import get_chat_state
 from misskaty import app
 from misskaty.core.decorator.errors import capture_err
 from misskaty.core.decorator.permissions import adminsOnly, list_admins
@@ -91,8 +92,7 @@ async def del_filter(_, message):
 @app.on_message(filters.text & ~filters.private, group=8)
 @capture_err
 async def blacklist_filters_re(self, message):
-    text = message.text.lower().strip()
-    if not text:
+    if not message.text.strip():
         return
     chat_id = message.chat.id
     user = message.from_user
@@ -100,28 +100,26 @@ async def blacklist_filters_re(self, message):
         return
     if user.id in SUDO or user.id == OWNER_ID:
         return
-    list_of_filters = await get_blacklisted_words(chat_id)
-    for word in list_of_filters:
-        pattern = r"( |^|[^\w])" + re.escape(word) + r"( |$|[^\w])"
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            if user.id in await list_admins(chat_id):
-                return
-            try:
-                await message.delete_msg()
-                await message.chat.restrict_member(
-                    user.id,
-                    ChatPermissions(all_perms=False),
-                    until_date=datetime.now() + timedelta(hours=1),
-                )
-            except ChatAdminRequired:
-                return await message.reply(
-                    "Please give me admin permissions to blacklist user", quote=False
-                )
-            except Exception as err:
-                self.log.info(f"ERROR Blacklist Chat: ID = {chat_id}, ERR = {err}")
-                return
-            await app.send_message(
-                chat_id,
-                f"Muted {user.mention} [`{user.id}`] for 1 hour "
-                + f"due to a blacklist match on {word}.",
-            )
+    matcher = (await get_chat_state(message)).blacklist
+    word = blacklist_engine.search(matcher, message.text)
+    if not word or user.id in await list_admins(chat_id):
+        return
+    try:
+        await message.delete_msg()
+        await message.chat.restrict_member(
+            user.id,
+            ChatPermissions(all_perms=False),
+            until_date=datetime.now() + timedelta(hours=1),
+        )
+    except ChatAdminRequired:
+        return await message.reply(
+            "Please give me admin permissions to blacklist user", quote=False
+        )
+    except Exception as err:
+        self.log.info(f"ERROR Blacklist Chat: ID = {chat_id}, ERR = {err}")
+        return
+    await app.send_message(
+        chat_id,
+        f"Muted {user.mention} [`{user.id}`] for 1 hour "
+        + f"due to a blacklist match on {word}.",
+    )
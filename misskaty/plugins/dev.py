@@ -53,9 +53,12 @@ from pyrogram.types import (
 )
 
 from database.gban_db import add_gban_user, is_gbanned_user, remove_gban_user
+from database.instrument import profiler
 from database.users_chats_db import db
 from misskaty import BOT_NAME, app, botStartTime, misskaty_version, user
 from misskaty.core.decorator import new_task
+from misskaty.core.metrics import slowest_handlers, totals
+from misskaty.core.watchdog import watchdog
 from misskaty.helper.eval_helper import format_exception, meval
 from misskaty.helper.functions import extract_user, extract_user_and_reason
 from misskaty.helper.http import fetch
@@ -78,6 +81,9 @@ __HELP__ = """
 /gban - To Ban A User Globally.
 /ungban - To remove ban user globbaly.
 /restart - update and restart bot.
+/perf [count] - Show the slowest handlers.
+/looplag - Show event loop lag and the code that blocked it.
+/mongostat - Show the costliest Mongo operations and N+1 suspects.
 
 **For Public Use**
 /stats - Check statistic bot
@@ -435,6 +441,75 @@ async def unban_globally(_, ctx: Message):
         await ctx.reply_text(f"Lifted {user_mention}'s Global Ban.'")
 
 
+@app.on_message(filters.command(["perf"], COMMAND_HANDLER) & filters.user(OWNER_ID))
+async def perf_report(_, ctx: Message):
+    limit = int(ctx.command[1]) if len(ctx.command) > 1 and ctx.command[1].isdigit() else 10
+    rows = slowest_handlers(limit)
+    if not rows:
+        return await ctx.reply_msg("No handler has run yet.")
+    updates = totals["updates"] or 1
+    text = (
+        f"<b>Slowest handlers (p95)</b>\n"
+        f"Updates: {totals['updates']} | RPC/update: {totals['rpc'] / updates:.2f} | "
+        f"Mongo/update: {totals['mongo'] / updates:.2f}\n\n"
+    )
+    for name, s in rows:
+        text += (
+            f"<code>{name}</code>\n"
+            f"  n={s['count']} err={s['errors']} p50={s['p50'] * 1000:.0f}ms "
+            f"p95={s['p95'] * 1000:.0f}ms p99={s['p99'] * 1000:.0f}ms "
+            f"rpc={s['rpc']} mongo={s['mongo']}\n"
+        )
+    await ctx.reply_msg(text)
+
+
+@app.on_message(filters.command(["looplag"], COMMAND_HANDLER) & filters.user(OWNER_ID))
+async def loop_lag_report(_, ctx: Message):
+    stats = watchdog.stats()
+    text = (
+        f"<b>Event loop</b>\n"
+        f"Lag: {stats['lag_ms']}ms | p95: {stats['p95_ms']}ms | max: {stats['max_ms']}ms\n"
+        f"Stalls over {watchdog.threshold * 1000:.0f}ms: {stats['stalls']}\n"
+    )
+    if stats["offenders"]:
+        text += "\n<b>Blocking code</b>\n"
+        text += "".join(
+            f"{count}x <code>{html.escape(location)}</code>\n"
+            for location, count in stats["offenders"].items()
+        )
+    if watchdog.samples:
+        last = watchdog.samples[-1]
+        text += f"\n<b>Last stall ({last['blocked_ms']}ms)</b>\n<pre>{html.escape(last['stack'][-2500:])}</pre>"
+    await ctx.reply_msg(text)
+
+
+@app.on_message(filters.command(["mongostat"], COMMAND_HANDLER) & filters.user(OWNER_ID))
+async def mongo_report(_, ctx: Message):
+    ops = profiler.top_ops(10)
+    if not ops:
+        return await ctx.reply_msg("No Mongo operation recorded yet.")
+    text = "<b>Mongo operations by total time</b>\n"
+    for name, s in ops:
+        text += (
+            f"<code>{name}</code> n={s['count']} err={s['errors']} "
+            f"p50={s['p50'] * 1000:.0f}ms p95={s['p95'] * 1000:.0f}ms "
+            f"total={s['avg'] * s['count']:.1f}s\n"
+        )
+    text += "\n<b>Calls per handler run</b>\n"
+    text += "".join(
+        f"{per_run:.1f}x <code>{op}</code> in <code>{handler}</code>\n"
+        for handler, op, per_run in profiler.per_run(10)
+    )
+    if profiler.slow:
+        text += f"\n<b>Slow queries (>= {profiler.slow_ms}ms)</b>\n"
+        text += "".join(
+            f"{q['ms']}ms <code>{q['op']}</code> by <code>{q['handler']}</code>: "
+            f"<code>{html.escape(q['query'])}</code>\n"
+            for q in list(profiler.slow)[-5:]
+        )
+    await ctx.reply_msg(text)
+
+
 @app.on_message(
     filters.command(["shell", "sh", "term"], COMMAND_HANDLER) & filters.user(OWNER_ID)
 )
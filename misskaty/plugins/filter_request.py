@@ -14,6 +14,7 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from misskaty import app
 from misskaty.core.decorator.errors import capture_err
 from misskaty.core.decorator.permissions import admins_in_chat
+from misskaty.core.ratelimit import RateLimiter
 from misskaty.helper.time_gap import check_time_gap
 from utils import temp
 
@@ -22,7 +23,10 @@ from .web_scraper import SCRAP_DICT, data_kuso
 from .ytdl_plugins import YT_DB
 
 chat = [-1001128045651, -1001255283935, -1001455886928]
-REQUEST_DB = {}
+# 3 requests per user a day, only given back by the 2 AM reset in clear_reqdict
+REQUEST_DB = RateLimiter(
+    "film_request", capacity=3, period=24 * 60 * 60, refill=False
+)
 
 
 # This modules is only working for my movies group to help collect a list of film requests by members.
@@ -84,11 +88,7 @@ async def request_user(client, message):
     )
     try:
         user_id = message.from_user.id
-        if user_id in REQUEST_DB:
-            REQUEST_DB[user_id] += 1
-        else:
-            REQUEST_DB[user_id] = 1
-        if REQUEST_DB[user_id] > 3:
+        if REQUEST_DB.hit(user_id):
             return await message.reply(
                 f"Mohon maaf {message.from_user.mention}, maksimal request hanya 3x perhari. Kalo mau tambah 5k per request 😝😝."
             )
@@ -126,7 +126,7 @@ async def request_user(client, message):
                 ]
             )
         await message.reply_text(
-            text=f"Hai {message.from_user.mention}, request kamu sudah dikirim yaa. Harap bersabar mungkin admin juga punya kesibukan lain.\n\n<b>Sisa Request:</b> {3 - REQUEST_DB[user_id]}x",
+            text=f"Hai {message.from_user.mention}, request kamu sudah dikirim yaa. Harap bersabar mungkin admin juga punya kesibukan lain.\n\n<b>Sisa Request:</b> {REQUEST_DB.remaining(user_id)}x",
             quote=True,
             reply_markup=markup2,
         )
@@ -136,12 +136,12 @@ async def request_user(client, message):
 
 # To reduce cache and disk
 async def clear_reqdict():
-    SCRAP_DICT.clear()
-    data_kuso.clear()
-    REQUEST_DB.clear()
-    PYPI_DICT.clear()
+    await SCRAP_DICT.clear()
+    await data_kuso.clear()
+    REQUEST_DB.reset()
+    await PYPI_DICT.clear()
     YT_DB.clear()
-    admins_in_chat.clear()
+    await admins_in_chat.clear()
     temp.MELCOW.clear()
     shutil.rmtree("downloads", ignore_errors=True)
     shutil.rmtree("GensSS", ignore_errors=True)
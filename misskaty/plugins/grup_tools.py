@@ -16,7 +16,8 @@ from pyrogram.errors import (
 )
 from pyrogram.types import ChatMemberUpdated, InlineKeyboardButton, InlineKeyboardMarkup
 
-from database.greetings_db import is_welcome, toggle_welcome
+from database.chat_state import get_chat_state
+from database.greetings_db import toggle_welcome
 from database.users_chats_db import db
 from misskaty import BOT_USERNAME, app
 from misskaty.core.decorator import asyncify, capture_err
@@ -102,7 +103,7 @@ async def member_has_joined(c: Client, member: ChatMemberUpdated, strings):
         and not member.old_chat_member
     ):
         return
-    if not await is_welcome(member.chat.id):
+    if not (await get_chat_state(member)).welcome:
         return
     user = member.new_chat_member.user if member.new_chat_member else member.from_user
     if user.id == OWNER_ID:
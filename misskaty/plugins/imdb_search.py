@@ -33,11 +33,20 @@ from pyrogram.types import (
 
 from database.imdb_db import add_imdbset, is_imdbset, remove_imdbset
 from misskaty import app
-from misskaty.helper import GENRES_EMOJI, Cache, fetch, gtranslate, get_random_string, search_jw
+from misskaty.helper import GENRES_EMOJI, AsyncCache, fetch, gtranslate, get_random_string, memo_cache, search_jw
 from utils import demoji
 
 LOGGER = logging.getLogger("MissKaty")
-LIST_CARI = Cache(filename="imdb_cache.db", path="cache", in_memory=False)
+LIST_CARI = AsyncCache(filename="imdb_cache.db", path="cache", in_memory=False)
+
+
+@memo_cache.memoize(timeout=30 * 60, errors=(httpx.HTTPError,))
+async def imdb_suggestions(kueri):
+    r = await fetch.get(
+        f"https://v3.sg.media-imdb.com/suggestion/titles/x/{quote_plus(kueri)}.json"
+    )
+    r.raise_for_status()
+    return r.json().get("d")
 
 
 # IMDB Choose Language
@@ -61,7 +70,7 @@ async def imdb_choose(_, ctx: Message):
             return await imdb_search_id(kuery, ctx)
     buttons = InlineKeyboard()
     ranval = get_random_string(4)
-    LIST_CARI.add(ranval, kuery, timeout=15)
+    await LIST_CARI.add(ranval, kuery, timeout=15)
     buttons.row(
         InlineButton("🇺🇸 English", f"imdbcari#eng#{ranval}#{ctx.from_user.id}"),
         InlineButton("🇮🇩 Indonesia", f"imdbcari#ind#{ranval}#{ctx.from_user.id}"),
@@ -135,11 +144,7 @@ async def imdb_search_id(kueri, message):
     buttons = InlineKeyboard(row_width=4)
     with contextlib.redirect_stdout(sys.stderr):
         try:
-            r = await fetch.get(
-                f"https://v3.sg.media-imdb.com/suggestion/titles/x/{quote_plus(kueri)}.json"
-            )
-            r.raise_for_status()
-            res = r.json().get("d")
+            res = await imdb_suggestions(kueri)
             if not res:
                 return await k.edit_caption(
                     f"⛔️ Tidak ditemukan hasil untuk kueri: <code>{kueri}</code>"
@@ -199,11 +204,7 @@ async def imdb_search_en(kueri, message):
     buttons = InlineKeyboard(row_width=4)
     with contextlib.redirect_stdout(sys.stderr):
         try:
-            r = await fetch.get(
-                f"https://v3.sg.media-imdb.com/suggestion/titles/x/{quote_plus(kueri)}.json"
-            )
-            r.raise_for_status()
-            res = r.json().get("d")
+            res = await imdb_suggestions(kueri)
             if not res:
                 return await k.edit_caption(
                     f"⛔️ Result not found for keywords: <code>{kueri}</code>"
@@ -260,8 +261,8 @@ async def imdbcari(_, query: CallbackQuery):
         if query.from_user.id != int(uid):
             return await query.answer("⚠️ Akses Ditolak!", True)
         try:
-            kueri = LIST_CARI.get(msg)
-            del LIST_CARI[msg]
+            kueri = await LIST_CARI[msg]
+            await LIST_CARI.delete(msg)
         except KeyError:
             return await query.message.edit_caption("⚠️ Callback Query Sudah Expired!")
         with contextlib.suppress(MessageIdInvalid, MessageNotModified):
@@ -272,11 +273,7 @@ async def imdbcari(_, query: CallbackQuery):
         buttons = InlineKeyboard(row_width=4)
         with contextlib.redirect_stdout(sys.stderr):
             try:
-                r = await fetch.get(
-                    f"https://v3.sg.media-imdb.com/suggestion/titles/x/{quote_plus(kueri)}.json"
-                )
-                r.raise_for_status()
-                res = r.json().get("d")
+                res = await imdb_suggestions(kueri)
                 if not res:
                     return await query.message.edit_caption(
                         f"⛔️ Tidak ditemukan hasil untuk kueri: <code>{kueri}</code>"
@@ -324,8 +321,8 @@ async def imdbcari(_, query: CallbackQuery):
         if query.from_user.id != int(uid):
             return await query.answer("⚠️ Access Denied!", True)
         try:
-            kueri = LIST_CARI.get(msg)
-            del LIST_CARI[msg]
+            kueri = await LIST_CARI[msg]
+            await LIST_CARI.delete(msg)
         except KeyError:
             return await query.message.edit_caption("⚠️ Callback Query Expired!")
         await query.message.edit_caption("<i>🔎 Looking in the IMDB Database..</i>")
@@ -333,11 +330,7 @@ async def imdbcari(_, query: CallbackQuery):
         buttons = InlineKeyboard(row_width=4)
         with contextlib.redirect_stdout(sys.stderr):
             try:
-                r = await fetch.get(
-                    f"https://v3.sg.media-imdb.com/suggestion/titles/x/{quote_plus(kueri)}.json"
-                )
-                r.raise_for_status()
-                res = r.json().get("d")
+                res = await imdb_suggestions(kueri)
                 if not res:
                     return await query.message.edit_caption(
                         f"⛔️ Result not found for keywords: <code>{kueri}</code>"
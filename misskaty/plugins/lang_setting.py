@@ -1,4 +1,3 @@
-from functools import partial
 from typing import Union
 
 from pyrogram import filters
@@ -16,12 +15,7 @@ from misskaty import app
 from misskaty.vars import COMMAND_HANDLER
 
 from ..core.decorator.permissions import require_admin
-from ..helper.localization import (
-    default_language,
-    get_locale_string,
-    langdict,
-    use_chat_lang,
-)
+from ..helper.localization import get_strings, langdict, use_chat_lang
 
 
 def gen_langs_kb():
@@ -95,12 +89,7 @@ async def set_chat_lang(_, m: CallbackQuery, strings):
     lang = m.data.split()[1]
     await set_db_lang(m.message.chat.id, m.message.chat.type, lang)
 
-    strings = partial(
-        get_locale_string,
-        langdict[lang].get("lang_setting", langdict[default_language]["lang_setting"]),
-        lang,
-        "lang_setting",
-    )
+    strings = get_strings(lang, "lang_setting")
 
     if m.message.chat.type == ChatType.PRIVATE:
         keyboard = InlineKeyboardMarkup(
@@ -25,6 +25,7 @@ SOFTWARE.
 import asyncio
 from logging import getLogger
 
+from cachetools import TTLCache
 from pyrogram import filters
 from pyrogram.errors import ChatAdminRequired, ChatNotModified, FloodWait
 from pyrogram.types import ChatPermissions
@@ -76,9 +77,13 @@ data = {
     "useradd": "can_invite_users",
     "pin": "can_pin_messages",
 }
+# chat_id -> default member permissions, dropped by /lock and /unlock
+chat_permissions = TTLCache(maxsize=5000, ttl=30 * 60)
 
 
 async def current_chat_permissions(chat_id):
+    if chat_id in chat_permissions:
+        return list(chat_permissions[chat_id])
     perms = []
     try:
         perm = (await app.get_chat(chat_id)).permissions
@@ -122,6 +127,7 @@ async def current_chat_permissions(chat_id):
     if perm.can_pin_messages:
         perms.append("can_pin_messages")
 
+    chat_permissions[chat_id] = tuple(perms)
     return perms
 
 
@@ -186,6 +192,8 @@ async def locks_func(_, message):
             await message.reply_msg(
                 "Give me full admin permission to use this command."
             )
+    # Drop the snapshot once the change went through so url_detector refetches
+    chat_permissions.pop(chat_id, None)
 
 
 @app.on_message(filters.command("locks", COMMAND_HANDLER) & ~filters.private)
@@ -206,19 +214,19 @@ async def url_detector(_, message):
     chat_id = message.chat.id
     text = message.text.lower().strip()
 
-    if not text or not user:
+    if not text or not user or not get_urls_from_text(text):
         return
-    mods = await list_admins(chat_id)
-    if user.id in mods or user.id in SUDO or user.id == OWNER_ID:
+    if user.id in SUDO or user.id == OWNER_ID:
         return
-
-    if get_urls_from_text(text):
-        permissions = await current_chat_permissions(chat_id)
-        if "can_add_web_page_previews" not in permissions:
-            try:
-                await message.delete_msg()
-            except Exception:
-                await message.reply_msg(
-                    "This message contains a URL, "
-                    + "but i don't have enough permissions to delete it"
-                )
+    permissions = await current_chat_permissions(chat_id)
+    if "can_add_web_page_previews" in permissions:
+        return
+    if user.id in (await list_admins(chat_id) or []):
+        return
+    try:
+        await message.delete_msg()
+    except Exception:
+        await message.reply_msg(
+            "This message contains a URL, "
+            + "but i don't have enough permissions to delete it"
+        )
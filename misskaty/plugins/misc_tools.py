@@ -38,7 +38,7 @@ from pyrogram.types import (
 
 from misskaty import BOT_USERNAME, app
 from misskaty.core.decorator.errors import capture_err
-from misskaty.helper import fetch, gtranslate, gen_trans_image, rentry
+from misskaty.helper import fetch, gtranslate, gen_trans_image, memo_cache, rentry
 from misskaty.vars import COMMAND_HANDLER
 from utils import extract_user, get_file_id
 
@@ -573,6 +573,7 @@ async def close_callback(_, query: CallbackQuery):
         await query.message.reply_to_message.delete_msg()
 
 
+@memo_cache.memoize(is_failure=lambda movies: not movies.get("results"))
 async def mdlapi(title):
     link = f"https://kuryana.vercel.app/search/q/{title}"
     async with aiohttp.ClientSession() as ses, ses.get(link) as result:
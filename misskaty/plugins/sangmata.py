@@ -5,13 +5,12 @@
 from pyrogram import filters
 from pyrogram.types import Message
 
+from database.chat_state import get_chat_state
 from database.sangmata_db import (
-    add_userdata,
-    cek_userdata,
-    get_userdata,
     is_sangmata_on,
     sangmata_off,
     sangmata_on,
+    track_userdata,
 )
 from misskaty import app
 from misskaty.core.decorator.permissions import adminsOnly
@@ -32,23 +31,19 @@ This feature inspired from SangMata Bot. I'm created simple detection to check u
 )
 @use_chat_lang()
 async def cek_mataa(_, ctx: Message, strings):
-    if ctx.sender_chat or not await is_sangmata_on(ctx.chat.id):
+    if ctx.sender_chat or not (await get_chat_state(ctx)).sangmata:
         return
-    if not await cek_userdata(ctx.from_user.id):
-        return await add_userdata(
-            ctx.from_user.id,
-            ctx.from_user.username,
-            ctx.from_user.first_name,
-            ctx.from_user.last_name,
-        )
-    usernamebefore, first_name, lastname_before = await get_userdata(ctx.from_user.id)
-    msg = ""
-    if (
-        usernamebefore != ctx.from_user.username
-        or first_name != ctx.from_user.first_name
-        or lastname_before != ctx.from_user.last_name
-    ):
-        msg += f"👀 <b>Mata MissKaty</b>\n\n🌞 User: {ctx.from_user.mention} [<code>{ctx.from_user.id}</code>]\n"
+    before = await track_userdata(
+        ctx.from_user.id,
+        ctx.from_user.username,
+        ctx.from_user.first_name,
+        ctx.from_user.last_name,
+    )
+    # Unchanged or first seen user
+    if not before:
+        return
+    usernamebefore, first_name, lastname_before = before
+    msg = f"👀 <b>Mata MissKaty</b>\n\n🌞 User: {ctx.from_user.mention} [<code>{ctx.from_user.id}</code>]\n"
     if usernamebefore != ctx.from_user.username:
         usernamebefore = f"@{usernamebefore}" if usernamebefore else strings("no_uname")
         usernameafter = (
@@ -57,34 +52,16 @@ async def cek_mataa(_, ctx: Message, strings):
             else strings("no_uname")
         )
         msg += strings("uname_change_msg").format(bef=usernamebefore, aft=usernameafter)
-        await add_userdata(
-            ctx.from_user.id,
-            ctx.from_user.username,
-            ctx.from_user.first_name,
-            ctx.from_user.last_name,
-        )
     if first_name != ctx.from_user.first_name:
         msg += strings("firstname_change_msg").format(
             bef=first_name, aft=ctx.from_user.first_name
         )
-        await add_userdata(
-            ctx.from_user.id,
-            ctx.from_user.username,
-            ctx.from_user.first_name,
-            ctx.from_user.last_name,
-        )
     if lastname_before != ctx.from_user.last_name:
         lastname_before = lastname_before or strings("no_last_name")
         lastname_after = ctx.from_user.last_name or strings("no_last_name")
         msg += strings("lastname_change_msg").format(
             bef=lastname_before, aft=lastname_after
         )
-        await add_userdata(
-            ctx.from_user.id,
-            ctx.from_user.username,
-            ctx.from_user.first_name,
-            ctx.from_user.last_name,
-        )
     if msg != "":
         await ctx.reply_msg(msg, quote=False)
 
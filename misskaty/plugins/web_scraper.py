@@ -21,7 +21,7 @@ from pyrogram.types import Message
 
 from database import dbname
 from misskaty import app
-from misskaty.helper import Cache, Kusonime, fetch, post_to_telegraph, use_chat_lang
+from misskaty.helper import AsyncCache, Kusonime, PagedCache, fetch, post_to_telegraph, use_chat_lang
 
 __MODULE__ = "WebScraper"
 __HELP__ = """
@@ -42,8 +42,16 @@ __HELP__ = """
 """
 
 LOGGER = logging.getLogger("MissKaty")
-SCRAP_DICT = Cache(filename="scraper_cache.db", path="cache", in_memory=False)
-data_kuso = Cache(filename="kuso_cache.db", path="cache", in_memory=False)
+# One entry per search message, capped so the file stays small over months of uptime
+SCRAP_DICT = PagedCache(
+    AsyncCache(
+        filename="scraper_cache.db",
+        path="cache",
+        in_memory=False,
+        max_bytes=64 * 1024 * 1024,
+    )
+)
+data_kuso = AsyncCache(filename="kuso_cache.db", path="cache", in_memory=False)
 savedict = TTLCache(maxsize=1000, ttl=3600)
 webdb = dbname["web"]
 
@@ -80,7 +88,7 @@ def split_arr(arr, size: 5):
 
 # Terbit21 GetData
 async def getDataTerbit21(msg, kueri, CurrentPage, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         with contextlib.redirect_stdout(sys.stderr):
             try:
                 if kueri:
@@ -99,14 +107,15 @@ async def getDataTerbit21(msg, kueri, CurrentPage, strings):
         if not res.get("result"):
             await msg.edit_msg(strings("no_result"), del_in=5)
             return None, None
-        SCRAP_DICT.add(msg.id, [split_arr(res["result"], 6), kueri], timeout=1800)
+        await SCRAP_DICT.add(msg.id, split_arr(res["result"], 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     if kueri:
         TerbitRes = strings("header_with_query").format(web="Terbit21", kueri=kueri)
     else:
         TerbitRes = strings("header_no_query").format(web="Terbit21", cmd="terbit21")
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         TerbitRes += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('cat_text')}:</b> <code>{i['kategori']}</code>\n"
         TerbitRes += (
             "\n"
@@ -118,7 +127,7 @@ async def getDataTerbit21(msg, kueri, CurrentPage, strings):
 
 # LK21 GetData
 async def getDatalk21(msg, kueri, CurrentPage, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         with contextlib.redirect_stdout(sys.stderr):
             try:
                 if kueri:
@@ -135,14 +144,15 @@ async def getDatalk21(msg, kueri, CurrentPage, strings):
         if not res.get("result"):
             await msg.edit_msg(strings("no_result"), del_in=5)
             return None, None
-        SCRAP_DICT.add(msg.id, [split_arr(res["result"], 6), kueri], timeout=1800)
+        await SCRAP_DICT.add(msg.id, split_arr(res["result"], 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     if kueri:
         lkResult = strings("header_with_query").format(web="Layarkaca21", kueri=kueri)
     else:
         lkResult = strings("header_no_query").format(web="Layarkaca21", cmd="lk21")
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         lkResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('cat_text')}:</b> <code>{i['kategori']}</code>\n"
         lkResult += (
             "\n"
@@ -154,7 +164,7 @@ async def getDatalk21(msg, kueri, CurrentPage, strings):
 
 # Pahe GetData
 async def getDataPahe(msg, kueri, CurrentPage, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         with contextlib.redirect_stdout(sys.stderr):
             try:
                 if kueri:
@@ -175,22 +185,23 @@ async def getDataPahe(msg, kueri, CurrentPage, strings):
         if not res.get("result"):
             await msg.edit_msg(strings("no_result"), del_in=5)
             return None, None
-        SCRAP_DICT.add(msg.id, [split_arr(res["result"], 6), kueri], timeout=1800)
+        await SCRAP_DICT.add(msg.id, split_arr(res["result"], 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     paheResult = (
         strings("header_with_query").format(web="Pahe", kueri=kueri)
         if kueri
         else strings("header_no_query").format(web="Pahe", cmd="pahe")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         paheResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n\n"
     return paheResult, PageLen
 
 
 # Kusonime GetData
 async def getDataKuso(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         kusodata = []
         with contextlib.redirect_stdout(sys.stderr):
             try:
@@ -213,9 +224,10 @@ async def getDataKuso(msg, kueri, CurrentPage, user, strings):
         if not kusodata:
             await msg.edit_msg(strings("no_result"), del_in=5)
             return None, 0, None, None
-        SCRAP_DICT.add(msg.id, [split_arr(kusodata, 10), kueri], timeout=1800)
+        await SCRAP_DICT.add(msg.id, split_arr(kusodata, 10), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     extractbtn1 = []
     extractbtn2 = []
 
@@ -224,7 +236,7 @@ async def getDataKuso(msg, kueri, CurrentPage, user, strings):
         if kueri == ""
         else strings("header_with_query").format(web="Kusonime", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         kusoResult += f"<b>{index*6+c}</b>. {i['title']}\n{i['link']}\n\n"
         if c < 6:
             extractbtn1.append(
@@ -243,7 +255,7 @@ async def getDataKuso(msg, kueri, CurrentPage, user, strings):
 
 # Movieku GetData
 async def getDataMovieku(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         moviekudata = []
         with contextlib.redirect_stdout(sys.stderr):
             try:
@@ -267,9 +279,10 @@ async def getDataMovieku(msg, kueri, CurrentPage, user, strings):
         if not moviekudata:
             await msg.edit_msg(strings("no_result"), del_in=5)
             return None, 0, None
-        SCRAP_DICT.add(msg.id, [split_arr(moviekudata, 6), kueri], timeout=1800)
+        await SCRAP_DICT.add(msg.id, split_arr(moviekudata, 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     extractbtn = []
 
     moviekuResult = (
@@ -277,7 +290,7 @@ async def getDataMovieku(msg, kueri, CurrentPage, user, strings):
         if kueri == ""
         else strings("header_with_query").format(web="Movieku", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         moviekuResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('quality')}/Status:</b> {i['type']}\n\n"
         extractbtn.append(
             InlineButton(
@@ -289,7 +302,7 @@ async def getDataMovieku(msg, kueri, CurrentPage, user, strings):
 
 # NoDrakor GetData
 async def getDataNodrakor(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         nodrakordata = []
         with contextlib.redirect_stdout(sys.stderr):
             try:
@@ -320,16 +333,17 @@ async def getDataNodrakor(msg, kueri, CurrentPage, user, strings):
             judul = i.find(class_="entry-title").find("a").text
             link = i.find(class_="entry-title").find("a").get("href")
             nodrakordata.append({"judul": judul, "link": link, "genre": genre})
-        SCRAP_DICT.add(msg.id, [split_arr(nodrakordata, 6), kueri], timeout=1800)
+        await SCRAP_DICT.add(msg.id, split_arr(nodrakordata, 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     extractbtn = []
     nodrakorResult = (
         strings("header_no_query").format(web="NoDrakor", cmd="nodrakor")
         if kueri == ""
         else strings("header_with_query").format(web="NoDrakor", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         nodrakorResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> {i['genre']}\n\n"
         extractbtn.append(
             InlineButton(
@@ -341,7 +355,7 @@ async def getDataNodrakor(msg, kueri, CurrentPage, user, strings):
 
 # Savefilm21 GetData
 async def getDataSavefilm21(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         sfdata = []
         with contextlib.redirect_stdout(sys.stderr):
             try:
@@ -372,16 +386,17 @@ async def getDataSavefilm21(msg, kueri, CurrentPage, user, strings):
             judul = i.find(class_="entry-title").find("a").text
             link = i.find(class_="entry-title").find("a").get("href")
             sfdata.append({"judul": judul, "link": link, "genre": genre})
-        SCRAP_DICT.add(msg.id, [split_arr(sfdata, 6), kueri], timeout=1800)
+        await SCRAP_DICT.add(msg.id, split_arr(sfdata, 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     extractbtn = []
     sfResult = (
         strings("header_no_query").format(web="Savefilm21", cmd="savefilm21")
         if kueri == ""
         else strings("header_with_query").format(web="Savefilm21", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         sfResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> {i['genre']}\n\n"
         extractbtn.append(
             InlineButton(
@@ -393,7 +408,7 @@ async def getDataSavefilm21(msg, kueri, CurrentPage, user, strings):
 
 # NunaDrama GetData
 async def getDataNunaDrama(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         with contextlib.redirect_stdout(sys.stderr):
             try:
                 nunafetch = await fetch.get(
@@ -424,9 +439,10 @@ async def getDataNunaDrama(msg, kueri, CurrentPage, user, strings):
                 judul = i.find(class_="entry-title").find("a").text
                 link = i.find(class_="entry-title").find("a").get("href")
                 data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
+            await SCRAP_DICT.add(msg.id, split_arr(data, 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     extractbtn = []
 
     nunaResult = (
@@ -434,7 +450,7 @@ async def getDataNunaDrama(msg, kueri, CurrentPage, user, strings):
         if kueri
         else strings("header_no_query").format(web="NunaDrama", cmd="nunadrama")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         nunaResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
         if not re.search(r"Series", i["genre"]):
             extractbtn.append(
@@ -448,7 +464,7 @@ async def getDataNunaDrama(msg, kueri, CurrentPage, user, strings):
 
 # PusatFilm21 GetData
 async def getDataPusatFilm(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         with contextlib.redirect_stdout(sys.stderr):
             try:
                 nunafetch = await fetch.get(
@@ -479,9 +495,10 @@ async def getDataPusatFilm(msg, kueri, CurrentPage, user, strings):
                 judul = i.find(class_="entry-title").find("a").text
                 link = i.find(class_="entry-title").find("a").get("href")
                 data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
+            await SCRAP_DICT.add(msg.id, split_arr(data, 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     extractbtn = []
 
     pfResult = (
@@ -489,7 +506,7 @@ async def getDataPusatFilm(msg, kueri, CurrentPage, user, strings):
         if kueri
         else strings("header_no_query").format(web="PusatFilm21", cmd="pusatfilm")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         pfResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
         if not re.search(r"Series", i["genre"]):
             extractbtn.append(
@@ -503,7 +520,7 @@ async def getDataPusatFilm(msg, kueri, CurrentPage, user, strings):
 
 # DutaMovie GetData
 async def getDataDutaMovie(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         with contextlib.redirect_stdout(sys.stderr):
             try:
                 nunafetch = await fetch.get(
@@ -534,9 +551,10 @@ async def getDataDutaMovie(msg, kueri, CurrentPage, user, strings):
                 judul = i.find(class_="entry-title").find("a").text
                 link = i.find(class_="entry-title").find("a").get("href")
                 data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
+            await SCRAP_DICT.add(msg.id, split_arr(data, 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     extractbtn = []
 
     dutaResult = (
@@ -544,7 +562,7 @@ async def getDataDutaMovie(msg, kueri, CurrentPage, user, strings):
         if kueri
         else strings("header_no_query").format(web="DutaMovie", cmd="dutamovie")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         dutaResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
         if not re.search(r"Series", i["genre"]):
             extractbtn.append(
@@ -558,7 +576,7 @@ async def getDataDutaMovie(msg, kueri, CurrentPage, user, strings):
 
 # Lendrive GetData
 async def getDataLendrive(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.get(msg.id):
         with contextlib.redirect_stdout(sys.stderr):
             try:
                 if kueri:
@@ -623,7 +641,7 @@ async def getDataLendrive(msg, kueri, CurrentPage, user, strings):
 
 # MelongMovie GetData
 async def getDataMelong(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         with contextlib.redirect_stdout(sys.stderr):
             try:
                 data = await fetch.get(
@@ -651,9 +669,10 @@ async def getDataMelong(msg, kueri, CurrentPage, user, strings):
         if not melongdata:
             await msg.edit_msg(strings("no_result"), del_in=5)
             return None, 0, None
-        SCRAP_DICT.add(msg.id, [split_arr(melongdata, 6), kueri], timeout=1800)
+        await SCRAP_DICT.add(msg.id, split_arr(melongdata, 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     extractbtn = []
 
     melongResult = (
@@ -661,7 +680,7 @@ async def getDataMelong(msg, kueri, CurrentPage, user, strings):
         if kueri == ""
         else strings("header_with_query").format(web="Melongmovie", kueri=kueri)
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         melongResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('quality')}:</b> {i['quality']}\n\n"
         extractbtn.append(
             InlineButton(
@@ -673,7 +692,7 @@ async def getDataMelong(msg, kueri, CurrentPage, user, strings):
 
 # GoMov GetData
 async def getDataGomov(msg, kueri, CurrentPage, user, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.has(msg.id, CurrentPage - 1):
         with contextlib.redirect_stdout(sys.stderr):
             try:
                 gomovv = await fetch.get(
@@ -704,9 +723,10 @@ async def getDataGomov(msg, kueri, CurrentPage, user, strings):
                 judul = i.find(class_="entry-title").find("a").text
                 link = i.find(class_="entry-title").find("a").get("href")
                 data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
+            await SCRAP_DICT.add(msg.id, split_arr(data, 6), kueri, timeout=1800)
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = (await SCRAP_DICT[msg.id])[0]
+    page = await SCRAP_DICT.page(msg.id, index)
     extractbtn = []
 
     gomovResult = (
@@ -714,7 +734,7 @@ async def getDataGomov(msg, kueri, CurrentPage, user, strings):
         if kueri
         else strings("header_no_query").format(web="GoMov", cmd="gomov")
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
+    for c, i in enumerate(page, start=1):
         gomovResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
         if not re.search(r"Series", i["genre"]):
             extractbtn.append(
@@ -728,7 +748,7 @@ async def getDataGomov(msg, kueri, CurrentPage, user, strings):
 
 # getData samehada
 async def getSame(msg, query, current_page, strings):
-    if not SCRAP_DICT.get(msg.id):
+    if not await SCRAP_DICT.get(msg.id):
         cfse = cloudscraper.create_scraper()
         if query:
             data = cfse.get(f"{web['samehadaku']}/?s={query}")
@@ -1133,7 +1153,7 @@ async def sf21page_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):  # Gatau napa err ini
         return
     except KeyError:
@@ -1177,7 +1197,7 @@ async def sf21page_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):  # Gatau napa err ini
         return
     except KeyError:
@@ -1221,7 +1241,7 @@ async def sf21page_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):
         return
     except KeyError:
@@ -1264,7 +1284,7 @@ async def sf21page_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):  # Gatau napa err ini
         return
     except KeyError:
@@ -1308,7 +1328,7 @@ async def pfpage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):
         return
     except KeyError:
@@ -1352,7 +1372,7 @@ async def nodrakorpage_cb(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except (IndexError, ValueError):
         return
     except KeyError:
@@ -1396,7 +1416,7 @@ async def kusopage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1482,7 +1502,7 @@ async def moviekupage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1551,7 +1571,7 @@ async def terbit21page_callback(_, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1587,7 +1607,7 @@ async def melongpage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1629,7 +1649,7 @@ async def lk21page_callback(_, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1665,7 +1685,7 @@ async def pahepage_callback(_, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1701,7 +1721,7 @@ async def gomovpage_callback(self, callback_query, strings):
             return await callback_query.answer(strings("unauth"), True)
         message_id = int(callback_query.data.split("#")[2])
         CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
+        kueri = (await SCRAP_DICT[message_id])[1]
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1745,7 +1765,7 @@ async def kusonime_scrap(client, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await SCRAP_DICT.page(message_id, CurrentPage - 1))[idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1761,12 +1781,12 @@ async def kusonime_scrap(client, callback_query, strings):
         InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
     )
     try:
-        if init_url := data_kuso.get(link, False):
+        if init_url := await data_kuso.get(link, False):
             await callback_query.message.edit_msg(
                 init_url.get("ph_url"), reply_markup=keyboard
             )
         tgh = await kuso.telegraph(link, client.me.username)
-        data_kuso[link] = {"ph_url": tgh}
+        await data_kuso.set(link, {"ph_url": tgh})
         return await callback_query.message.edit_msg(tgh, reply_markup=keyboard)
     except Exception as e:
         LOGGER.error(f"clases: {e.__class__}, moduleName: {e.__class__.__name__}")
@@ -1784,7 +1804,7 @@ async def savefilm21_scrap(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await SCRAP_DICT.page(message_id, CurrentPage - 1))[idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1829,7 +1849,7 @@ async def nunadrama_ddl(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await SCRAP_DICT.page(message_id, CurrentPage - 1))[idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1879,7 +1899,7 @@ async def pusatfilm_ddl(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await SCRAP_DICT.page(message_id, CurrentPage - 1))[idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1924,7 +1944,7 @@ async def dutamovie_ddl(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await SCRAP_DICT.page(message_id, CurrentPage - 1))[idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -1974,7 +1994,7 @@ async def nodrakorddl_scrap(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await SCRAP_DICT.page(message_id, CurrentPage - 1))[idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -2035,7 +2055,7 @@ async def movieku_scrap(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await SCRAP_DICT.page(message_id, CurrentPage - 1))[idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -2106,7 +2126,7 @@ async def melong_scrap(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await SCRAP_DICT.page(message_id, CurrentPage - 1))[idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
@@ -2154,7 +2174,7 @@ async def gomov_dl(_, callback_query, strings):
         idlink = int(callback_query.data.split("#")[2])
         message_id = int(callback_query.data.split("#")[4])
         CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
+        link = (await SCRAP_DICT.page(message_id, CurrentPage - 1))[idlink - 1].get("link")
     except QueryIdInvalid:
         return
     except KeyError:
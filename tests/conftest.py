@@ -0,0 +1,172 @@
+"""
+Shared setup of the unit tests, run from the repo root with: python -m pytest tests
+
+Importing misskaty starts the bot and database/__init__ connects to Mongo,
+so both are registered here as bare packages pointing at their source
+directories, with an in-memory ``dbname`` standing in for the database.
+"""
+
+import sys
+from copy import deepcopy
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _eval(expr, doc):
+    """The aggregation expressions used by the update pipelines."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:])
+    if isinstance(expr, dict) and len(expr) == 1:
+        (op, args), = expr.items()
+        values = [_eval(arg, doc) for arg in args]
+        if op == "$add":
+            return sum(values)
+        if op == "$multiply":
+            result = 1
+            for value in values:
+                result *= value
+            return result
+        if op == "$ifNull":
+            return values[1] if values[0] is None else values[0]
+        raise NotImplementedError(op)
+    return expr
+
+
+def _matches(doc, query):
+    for field, cond in query.items():
+        if isinstance(cond, dict) and "$exists" in cond:
+            if (field in doc) != cond["$exists"]:
+                return False
+        elif doc.get(field) != cond:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+class FakeDeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class FakeCollection:
+    """The few collection methods the migrations and KeyedStore call."""
+
+    def __init__(self, name):
+        self.name = name
+        self.docs = []
+        self._ids = 0
+
+    def _insert(self, doc):
+        self._ids += 1
+        doc.setdefault("_id", f"{self.name}:{self._ids}")
+        self.docs.append(doc)
+        return doc
+
+    def _update(self, query, update, upsert):
+        doc = next((doc for doc in self.docs if _matches(doc, query)), None)
+        inserted = doc is None
+        if inserted:
+            if not upsert:
+                return
+            doc = self._insert(
+                {k: v for k, v in query.items() if not isinstance(v, dict)}
+            )
+        if isinstance(update, list):
+            for stage in update:
+                values = {k: _eval(v, doc) for k, v in stage["$set"].items()}
+                doc.update(values)
+            return
+        doc.update(update.get("$set", {}))
+        if inserted:
+            doc.update(update.get("$setOnInsert", {}))
+        for field, amount in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + amount
+
+    async def create_index(self, *args, **kwargs):
+        return None
+
+    def find(self, query=None, projection=None):
+        return FakeCursor(
+            [deepcopy(doc) for doc in self.docs if _matches(doc, query or {})]
+        )
+
+    async def find_one(self, query=None, projection=None):
+        return next(
+            (deepcopy(doc) for doc in self.docs if _matches(doc, query or {})), None
+        )
+
+    async def insert_one(self, doc):
+        self._insert(deepcopy(doc))
+
+    async def update_one(self, query, update, upsert=False):
+        self._update(query, update, upsert)
+
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            self._update(request._filter, request._doc, request._upsert)
+
+    async def delete_one(self, query):
+        for doc in self.docs:
+            if _matches(doc, query):
+                self.docs.remove(doc)
+                return FakeDeleteResult(1)
+        return FakeDeleteResult(0)
+
+    async def delete_many(self, query):
+        before = len(self.docs)
+        self.docs = [doc for doc in self.docs if not _matches(doc, query)]
+        return FakeDeleteResult(before - len(self.docs))
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        collection = self[name] = FakeCollection(name)
+        return collection
+
+
+def _package(name, path, **attrs):
+    module = sys.modules.get(name)
+    if module is None:
+        module = sys.modules[name] = ModuleType(name)
+        module.__path__ = [str(path)]
+    module.__dict__.update(attrs)
+    return module
+
+
+async def _alpha_to_int(user_id_alphabet: str) -> int:
+    # Same mapping as misskaty.helper.functions, which imports the bot client
+    return int("".join(str("abcdefghij".index(char)) for char in user_id_alphabet))
+
+
+dbname = FakeDatabase()
+_package("database", ROOT / "database", dbname=dbname)
+_package("misskaty", ROOT / "misskaty")
+_package("misskaty.core", ROOT / "misskaty" / "core")
+_package("misskaty.helper", ROOT / "misskaty" / "helper")
+sys.modules["misskaty.helper.functions"] = ModuleType("misskaty.helper.functions")
+sys.modules["misskaty.helper.functions"].alpha_to_int = _alpha_to_int
+
+
+@pytest.fixture
+def db():
+    """The fake ``database.dbname``, emptied before each test."""
+    for collection in dbname.values():
+        collection.docs.clear()
+    return dbname
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from database.karma_db import migrate_karma
+
+
+def karma(db):
+    return {(doc["chat_id"], doc["user_id"]): doc["karma"] for doc in db["karma_users"].docs}
+
+
+def legacy_chat(db):
+    # Users were keyed by their id spelled with the letters a-j
+    db["karma"].docs.append(
+        {"_id": 1, "chat_id": -100, "karma": {"bcd": {"karma": 5}, "e": {"karma": -2}}}
+    )
+
+
+def test_migrate_moves_legacy_karma(db):
+    legacy_chat(db)
+    asyncio.run(migrate_karma())
+    assert karma(db) == {(-100, 123): 5, (-100, 4): -2}
+    assert db["karma"].docs == []
+
+
+def test_migrate_twice_changes_nothing(db):
+    legacy_chat(db)
+    asyncio.run(migrate_karma())
+    asyncio.run(migrate_karma())
+    assert karma(db) == {(-100, 123): 5, (-100, 4): -2}
+
+
+def test_interrupted_migration_is_not_counted_twice(db, monkeypatch):
+    legacy_chat(db)
+
+    async def crash(query):
+        raise ConnectionError("lost connection before the delete")
+
+    monkeypatch.setattr(db["karma"], "delete_one", crash)
+    with pytest.raises(ConnectionError):
+        asyncio.run(migrate_karma())
+    monkeypatch.undo()
+    # Karma given while the legacy document was still around
+    db["karma_users"].docs[0]["karma"] += 1
+
+    asyncio.run(migrate_karma())
+    assert karma(db) == {(-100, 123): 6, (-100, 4): -2}
+    assert db["karma"].docs == []
+
+
+def test_migrate_adds_to_karma_given_after_upgrade(db):
+    db["karma_users"].docs.append({"_id": "new", "chat_id": -100, "user_id": 123, "karma": 3})
+    legacy_chat(db)
+    asyncio.run(migrate_karma())
+    assert karma(db) == {(-100, 123): 8, (-100, 4): -2}
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from database.keyed_db import migrate_keyed_stores
+from database.notes_db import notesdb
+
+
+def entries(collection):
+    return {(doc["chat_id"], doc["name"]): doc["value"] for doc in collection.docs}
+
+
+def test_migrate_moves_legacy_dicts(db):
+    db["notes"].docs.append(
+        {"_id": 1, "chat_id": -100, "notes": {"rules": {"type": "text", "data": "be nice"}}}
+    )
+    asyncio.run(migrate_keyed_stores())
+    assert entries(db["notes_entries"]) == {
+        (-100, "rules"): {"type": "text", "data": "be nice"}
+    }
+    assert db["notes"].docs == []
+
+
+def test_migrate_twice_changes_nothing(db):
+    db["warn"].docs.append({"_id": 1, "chat_id": -100, "warns": {"42": {"warns": 2}}})
+    asyncio.run(migrate_keyed_stores())
+    migrated = entries(db["warn_entries"])
+    asyncio.run(migrate_keyed_stores())
+    assert entries(db["warn_entries"]) == migrated
+    assert len(db["warn_entries"].docs) == 1
+
+
+def test_interrupted_migration_can_be_rerun(db, monkeypatch):
+    db["filters"].docs.append(
+        {"_id": 1, "chat_id": -100, "filters": {"hi": {"type": "text", "data": "hello"}}}
+    )
+
+    async def crash(query):
+        raise ConnectionError("lost connection before the delete")
+
+    monkeypatch.setattr(db["filters"], "delete_one", crash)
+    with pytest.raises(ConnectionError):
+        asyncio.run(migrate_keyed_stores())
+    monkeypatch.undo()
+
+    asyncio.run(migrate_keyed_stores())
+    assert entries(db["filters_entries"]) == {(-100, "hi"): {"type": "text", "data": "hello"}}
+    assert db["filters"].docs == []
+
+
+def test_migrate_keeps_entries_written_after_upgrade(db):
+    asyncio.run(notesdb.put(-100, "rules", {"type": "text", "data": "new"}))
+    db["notes"].docs.append(
+        {"_id": 1, "chat_id": -100, "notes": {"rules": {"type": "text", "data": "old"}}}
+    )
+    asyncio.run(migrate_keyed_stores())
+    assert entries(db["notes_entries"]) == {(-100, "rules"): {"type": "text", "data": "new"}}
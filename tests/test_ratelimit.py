@@ -0,0 +1,69 @@
+import pytest
+
+from misskaty.core import ratelimit
+from misskaty.core.ratelimit import RateLimiter, hit_all
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_capacity_then_throttles(clock):
+    limiter = RateLimiter("test_capacity", capacity=3, period=30)
+    assert [limiter.hit(1) for _ in range(3)] == [0, 0, 0]
+    # One token every 10 seconds
+    assert limiter.hit(1) == pytest.approx(10)
+    assert limiter.stats()["allowed"] == 3
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = RateLimiter("test_refill", capacity=3, period=30)
+    for _ in range(3):
+        limiter.hit(1)
+    clock[0] += 10
+    assert limiter.hit(1) == 0
+    assert limiter.hit(1) > 0
+
+
+def test_buckets_are_per_key(clock):
+    limiter = RateLimiter("test_keys", capacity=1, period=60)
+    assert limiter.hit(1) == 0
+    assert limiter.hit(1) > 0
+    assert limiter.hit(2) == 0
+
+
+def test_should_warn_once_per_flood(clock):
+    limiter = RateLimiter("test_warn", capacity=1, period=60)
+    limiter.hit(1)
+    limiter.hit(1)
+    assert limiter.should_warn(1)
+    assert not limiter.should_warn(1)
+    clock[0] += 60
+    assert limiter.hit(1) == 0
+    limiter.hit(1)
+    assert limiter.should_warn(1)
+
+
+def test_hit_all_takes_nothing_when_one_bucket_is_empty(clock):
+    chat = RateLimiter("test_chat", capacity=2, period=60)
+    user = RateLimiter("test_user", capacity=1, period=60)
+    assert hit_all((chat, -100), (user, 1)) == (None, 0)
+    limiter, delay = hit_all((chat, -100), (user, 1))
+    assert limiter is user and delay == pytest.approx(60)
+    # The throttled user did not use up the chat's last token
+    assert chat.remaining(-100) == 1
+    assert hit_all((chat, -100), (user, 2)) == (None, 0)
+
+
+def test_fixed_quota_only_comes_back_on_reset(clock):
+    quota = RateLimiter("test_quota", capacity=3, period=24 * 60 * 60, refill=False)
+    assert [quota.hit(1) for _ in range(3)] == [0, 0, 0]
+    clock[0] += 23 * 60 * 60
+    assert quota.hit(1) > 0
+    assert quota.remaining(1) == 0
+    quota.reset()
+    assert quota.remaining(1) == 3
@@ -0,0 +1,58 @@
+import random
+import re
+import string
+
+import pytest
+
+from database.word_matcher import WordMatcher, normalize_text
+
+
+def old_matches(words, text):
+    """The per-word check filters_re and the blacklist ran before WordMatcher."""
+    return {
+        word
+        for word in words
+        if re.search(r"( |^|[^\w])" + re.escape(word) + r"( |$|[^\w])", text, flags=re.IGNORECASE)
+    }
+
+
+@pytest.mark.parametrize(
+    "words, text, expected",
+    [
+        ({"hi"}, "hi there", "hi"),
+        ({"hi"}, "oh, hi!", "hi"),
+        ({"hi"}, "this is it", None),
+        ({"hi"}, "hii", None),
+        ({"hi"}, "HI", "hi"),
+        ({"good morning"}, "well good morning all", "good morning"),
+        ({"c++"}, "I like c++ a lot", "c++"),
+        ({"a.b"}, "axb", None),
+        ({"hello", "hello world"}, "hello world", "hello world"),
+        ({"film"}, "film_baru", None),
+        (set(), "anything", None),
+    ],
+)
+def test_search(words, text, expected):
+    assert WordMatcher(words).search(text) == expected
+
+
+def test_same_matches_as_old_regex():
+    rng = random.Random(0)
+    alphabet = string.ascii_lowercase[:6] + " .,!-_"
+    for _ in range(300):
+        words = {
+            "".join(rng.choice(string.ascii_lowercase[:6]) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 8))
+        }
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        expected = old_matches(words, text)
+        found = WordMatcher(words).search(text)
+        if expected:
+            assert found in expected, (words, text)
+        else:
+            assert found is None, (words, text)
+
+
+def test_normalize_text_folds_fancy_letters():
+    assert normalize_text("  ＦＩＬＭ ") == "film"
+    assert WordMatcher({"film"}).search(normalize_text("download 𝐟𝐢𝐥𝐦 here")) == "film"
@@ -4,7 +4,7 @@ from time import time
 from datetime import datetime, timedelta
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from starlette.exceptions import HTTPException
 from psutil import boot_time, disk_usage, net_io_counters
 from contextlib import suppress
@@ -67,6 +67,12 @@ async def autopay(request: Request):
 
 @api.get("/status")
 async def status():
+    from database.chat_state import chat_state_stats
+    from misskaty.core.decorator.permissions import member_privileges
+    from misskaty.core.ratelimit import limiters
+    from misskaty.core.watchdog import watchdog
+    from misskaty.helper.sqlite_helper import cache_stats
+    from misskaty.helper.http import fetch
     from misskaty.helper.human_read import get_readable_file_size, get_readable_time
     bot_uptime = get_readable_time(time() - botStartTime)
     uptime = get_readable_time(time() - boot_time())
@@ -86,9 +92,21 @@ async def status():
             "sent": sent,
             "recv": recv,
         },
+        "ratelimit": {name: limiter.stats() for name, limiter in limiters.items()},
+        "member_privileges": member_privileges.stats(),
+        "chat_state": chat_state_stats(),
+        "event_loop": watchdog.stats(),
+        "cache": cache_stats(),
+        "http": fetch.stats(),
     }
 
 
+@api.get("/metrics")
+async def metrics():
+    from misskaty.core.metrics import render_prometheus
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @api.api_route("/")
 async def homepage():
     return "Hello World"